@@ -3,8 +3,9 @@ CV Analysis API Endpoint
 Handles CV upload and analysis requests
 """
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status
+from fastapi import APIRouter, Request, UploadFile, File, Form, HTTPException, status
 from fastapi.responses import JSONResponse
+from app.core.admission import admission_controller, tenant_key
 from app.schemas.analysis import AnalysisResponse, ErrorResponse
 from app.services.pdf_service import pdf_service
 from app.services.ai_service import ai_service
@@ -20,12 +21,15 @@ router = APIRouter()
     response_model=AnalysisResponse,
     responses={
         400: {"model": ErrorResponse},
-        500: {"model": ErrorResponse}
+        429: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse}
     },
     summary="Analyze CV against job description",
     description="Upload a CV (PDF) and provide a job description to get an AI-powered match analysis"
 )
 async def analyze_cv(
+    request: Request,
     cv_file: UploadFile = File(..., description="CV file in PDF format"),
     job_description: str = Form(..., description="Job description text")
 ):
@@ -37,6 +41,10 @@ async def analyze_cv(
     2. Extracts text from the PDF
     3. Sends CV text and job description to AI service
     4. Returns structured analysis with score, matching/missing skills, and recommendations
+    
+    Work is admitted per tenant (a configured X-API-Key, or the client
+    address) and globally; when a request cannot start in time it is rejected
+    with 429 or 503 and a Retry-After header instead of queueing without bound.
     """
     
     # Validate file type
@@ -54,55 +62,58 @@ async def analyze_cv(
             detail="Job description must be at least 10 characters"
         )
     
-    try:
-        # Read file content
-        cv_content = await cv_file.read()
+    async with admission_controller.admit(tenant_key(request)):
+        try:
+            # Read file content
+            cv_content = await cv_file.read()
         
-        # Check file size
-        file_size_mb = len(cv_content) / (1024 * 1024)
-        if file_size_mb > settings.MAX_FILE_SIZE_MB:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File size exceeds maximum limit of {settings.MAX_FILE_SIZE_MB}MB"
-            )
+            # Check file size
+            file_size_mb = len(cv_content) / (1024 * 1024)
+            if file_size_mb > settings.MAX_FILE_SIZE_MB:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"File size exceeds maximum limit of {settings.MAX_FILE_SIZE_MB}MB"
+                )
         
-        logger.info(f"Processing CV: {cv_file.filename} ({file_size_mb:.2f}MB)")
+            logger.info(f"Processing CV: {cv_file.filename} ({file_size_mb:.2f}MB)")
         
-        # Validate PDF
-        if not pdf_service.validate_pdf(cv_content):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid or corrupted PDF file"
-            )
+            # Validate PDF
+            if not await admission_controller.run_pdf(pdf_service.validate_pdf, cv_content):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid or corrupted PDF file"
+                )
         
-        # Extract text from PDF
-        try:
-            cv_text = pdf_service.extract_text_from_pdf(cv_content)
-        except ValueError as e:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=str(e)
-            )
+            # Extract text from PDF
+            try:
+                cv_text = await admission_controller.run_pdf(pdf_service.extract_text_from_pdf, cv_content)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e)
+                )
         
-        # Analyze CV with AI
-        try:
-            analysis_result = await ai_service.analyze_resume(cv_text, job_description)
+            # Analyze CV with AI (takes an LLM slot unless the result is cached)
+            try:
+                analysis_result = await ai_service.analyze_resume(cv_text, job_description)
+            except HTTPException:
+                raise
+            except Exception as e:
+                logger.error(f"AI analysis error: {str(e)}")
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Analysis failed: {str(e)}"
+                )
+        
+            logger.info(f"Successfully analyzed CV with score: {analysis_result.get('score', 0)}")
+        
+            return AnalysisResponse(**analysis_result)
+        
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"AI analysis error: {str(e)}")
+            logger.error(f"Unexpected error in analyze_cv: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Analysis failed: {str(e)}"
+                detail=f"An unexpected error occurred: {str(e)}"
             )
-        
-        logger.info(f"Successfully analyzed CV with score: {analysis_result.get('score', 0)}")
-        
-        return AnalysisResponse(**analysis_result)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in analyze_cv: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {str(e)}"
-        )
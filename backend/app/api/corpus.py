@@ -0,0 +1,114 @@
+"""
+Corpus API Endpoints
+Stores CVs and jobs so edits to a job only re-analyze the affected pairs
+"""
+
+import asyncio
+from typing import List
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, HTTPException, status
+from app.core.admission import admission_controller
+from app.schemas.analysis import ErrorResponse
+from app.schemas.corpus import (
+    JobRequest, JobResponse, JobResultsResponse, JobUpdateResponse, StoredCV
+)
+from app.services.pdf_service import pdf_service
+from app.services.ai_service import ai_service
+from app.services.corpus_store import corpus_store, process_reanalysis_queue
+from app.core.config import settings
+from app.utils.logger import logger
+
+
+router = APIRouter(prefix="/corpus")
+
+
+async def run_reanalysis() -> None:
+    """Background task draining the LLM re-analysis queue"""
+    stored = await process_reanalysis_queue(corpus_store, ai_service, settings.CORPUS_BATCH_SIZE)
+    logger.info(f"Re-analysis queue processed: {stored} result(s) stored")
+
+
+@router.post(
+    "/cvs",
+    response_model=List[StoredCV],
+    responses={400: {"model": ErrorResponse}},
+    summary="Store CVs in the corpus",
+    description="Extract and store CVs once; each is queued for analysis against every stored job"
+)
+async def add_cvs(
+    background_tasks: BackgroundTasks,
+    cv_files: List[UploadFile] = File(..., description="CV files in PDF format")
+):
+    """Parse and store CVs, then analyze them against existing jobs in the background"""
+    stored = []
+    for cv_file in cv_files:
+        if not cv_file.filename.lower().endswith('.pdf'):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Only PDF files are supported: {cv_file.filename}"
+            )
+        cv_content = await cv_file.read()
+        if len(cv_content) / (1024 * 1024) > settings.MAX_FILE_SIZE_MB:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File size exceeds maximum limit of {settings.MAX_FILE_SIZE_MB}MB: {cv_file.filename}"
+            )
+        try:
+            cv_text = await admission_controller.run_pdf(pdf_service.extract_text_from_pdf, cv_content)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{cv_file.filename}: {str(e)}"
+            )
+        # SQLite writes (and their busy wait) and CV parsing block: keep them off the event loop
+        record, created = await asyncio.to_thread(corpus_store.add_cv, cv_text, cv_file.filename)
+        stored.append(StoredCV(**record, created=created))
+
+    background_tasks.add_task(run_reanalysis)
+    return stored
+
+
+@router.post(
+    "/jobs",
+    response_model=JobResponse,
+    summary="Store a job description",
+    description="Store a job and queue its analysis against every stored CV"
+)
+async def add_job(request: JobRequest, background_tasks: BackgroundTasks):
+    """Create a job and analyze it against the corpus in the background"""
+    job = await asyncio.to_thread(corpus_store.add_job, request.title, request.description)
+    background_tasks.add_task(run_reanalysis)
+    return JobResponse(**job)
+
+
+@router.put(
+    "/jobs/{job_id}",
+    response_model=JobUpdateResponse,
+    responses={404: {"model": ErrorResponse}},
+    summary="Edit a job description",
+    description="Apply local skill deltas immediately and queue LLM re-analysis only where the outcome could change"
+)
+async def update_job(job_id: int, request: JobRequest, background_tasks: BackgroundTasks):
+    """Edit a job and incrementally re-score its stored analyses"""
+    try:
+        summary = await asyncio.to_thread(corpus_store.update_job, job_id, request.title, request.description)
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    if summary["queued"]:
+        background_tasks.add_task(run_reanalysis)
+    return JobUpdateResponse(**summary)
+
+
+@router.get(
+    "/jobs/{job_id}/results",
+    response_model=JobResultsResponse,
+    responses={404: {"model": ErrorResponse}},
+    summary="Get results for a job",
+    description="Return every CV's latest analysis for the job, best score first"
+)
+async def job_results(job_id: int):
+    """List stored analyses for a job"""
+    job = await asyncio.to_thread(corpus_store.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    results = await asyncio.to_thread(corpus_store.job_results, job_id)
+    return JobResultsResponse(job=JobResponse(**job), results=results)
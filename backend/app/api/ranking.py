@@ -0,0 +1,103 @@
+"""
+Candidate Ranking API Endpoints
+Indexes CVs locally and ranks them against a job description
+"""
+
+import asyncio
+from typing import List
+from fastapi import APIRouter, UploadFile, File, HTTPException, status
+from app.core.admission import admission_controller
+from app.schemas.analysis import AnalysisResponse, ErrorResponse
+from app.schemas.ranking import (
+    IndexedCandidate, IndexResponse, RankedCandidate, RankingRequest, RankingResponse
+)
+from app.services.pdf_service import pdf_service
+from app.services.ai_service import ai_service
+from app.services.vector_index import vector_index
+from app.core.config import settings
+from app.utils.logger import logger
+
+
+router = APIRouter()
+
+
+@router.post(
+    "/candidates",
+    response_model=IndexResponse,
+    responses={400: {"model": ErrorResponse}},
+    summary="Add CVs to the candidate index",
+    description="Upload one or more CV PDFs; their text is chunked and embedded once for later ranking"
+)
+async def index_candidates(
+    cv_files: List[UploadFile] = File(..., description="CV files in PDF format")
+):
+    """Extract, embed and store CVs; already-indexed CVs are not re-embedded"""
+    indexed = []
+    for cv_file in cv_files:
+        if not cv_file.filename.lower().endswith('.pdf'):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Only PDF files are supported: {cv_file.filename}"
+            )
+
+        cv_content = await cv_file.read()
+        if len(cv_content) / (1024 * 1024) > settings.MAX_FILE_SIZE_MB:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File size exceeds maximum limit of {settings.MAX_FILE_SIZE_MB}MB: {cv_file.filename}"
+            )
+
+        try:
+            cv_text = await admission_controller.run_pdf(pdf_service.extract_text_from_pdf, cv_content)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{cv_file.filename}: {str(e)}"
+            )
+
+        # Embedding, memmap writes and the index file lock block: keep them off the event loop
+        doc_id, created = await asyncio.to_thread(vector_index.add_document, cv_text, cv_file.filename)
+        indexed.append(IndexedCandidate(
+            id=doc_id,
+            filename=cv_file.filename,
+            chunks=vector_index.documents[doc_id]["chunks"],
+            created=created,
+        ))
+
+    return IndexResponse(candidates=indexed, total_indexed=await asyncio.to_thread(len, vector_index))
+
+
+@router.post(
+    "/candidates/rank",
+    response_model=RankingResponse,
+    summary="Rank indexed CVs against a job description",
+    description="Returns the top-K CVs by embedding similarity; optionally runs the AI analysis on those K only"
+)
+async def rank_candidates(request: RankingRequest):
+    """Shortlist candidates with a local similarity search, then analyze the shortlist"""
+    matches = await asyncio.to_thread(vector_index.search, request.job_description, request.top_k)
+    total_indexed = await asyncio.to_thread(len, vector_index)
+    logger.info(f"Ranked {total_indexed} indexed CVs, returning top {len(matches)}")
+
+    ranked = [
+        RankedCandidate(id=doc["id"], filename=doc["filename"], similarity=round(score, 4))
+        for doc, score in matches
+    ]
+
+    if request.analyze and matches:
+        semaphore = asyncio.Semaphore(settings.RANK_ANALYZE_CONCURRENCY)
+
+        async def analyze(candidate: RankedCandidate, cv_text: str) -> None:
+            async with semaphore:
+                try:
+                    result = await ai_service.analyze_resume(cv_text, request.job_description)
+                    candidate.analysis = AnalysisResponse(**result)
+                except Exception as e:
+                    logger.error(f"AI analysis failed for candidate {candidate.id}: {str(e)}")
+                    candidate.error = str(e)
+
+        await asyncio.gather(*(
+            analyze(candidate, doc["text"]) for candidate, (doc, _) in zip(ranked, matches)
+        ))
+
+    return RankingResponse(candidates=ranked, total_indexed=total_indexed)
@@ -0,0 +1,52 @@
+"""
+Skill Matrix API Endpoints
+Fast local "who matches which roles" overview for many CVs and jobs at once
+"""
+
+from fastapi import APIRouter, Query
+from app.schemas.skills import SkillMatrixRequest, SkillMatrixResponse
+from app.services.corpus_store import corpus_store
+from app.services.skill_matrix import skill_matrix_service
+from app.utils.logger import logger
+
+
+router = APIRouter(prefix="/skills")
+
+# The endpoints are CPU-bound (skill extraction, sparse product, dense summary),
+# so they are plain functions: FastAPI runs them in its thread pool, off the event loop
+
+
+@router.post(
+    "/matrix",
+    response_model=SkillMatrixResponse,
+    summary="Match many CVs against many jobs",
+    description="Compute keyword coverage for every CV/job pair in one sparse matrix product (no LLM calls)"
+)
+def skill_matrix(request: SkillMatrixRequest):
+    """Build the coverage/missing-skill matrix for the submitted texts"""
+    matrix = skill_matrix_service.match_texts(
+        [cv.text for cv in request.cvs], [job.text for job in request.jobs]
+    )
+    logger.info(f"Computed skill matrix for {len(request.cvs)} CVs x {len(request.jobs)} jobs")
+    return skill_matrix_service.summarize(
+        matrix, [cv.id for cv in request.cvs], [job.id for job in request.jobs], request.top_n
+    )
+
+
+@router.get(
+    "/matrix/corpus",
+    response_model=SkillMatrixResponse,
+    summary="Match every stored CV against every stored job",
+    description="Skill matrix over the corpus, reusing the skills extracted when CVs and jobs were stored"
+)
+def corpus_skill_matrix(top_n: int = Query(default=5, ge=0, le=100)):
+    """Build the skill matrix from the corpus without re-reading any text"""
+    cv_sets = corpus_store.cv_skill_sets()
+    job_sets = corpus_store.job_requirement_sets()
+    matrix = skill_matrix_service.compute(
+        skill_matrix_service.encode_skill_sets([skills for _, skills in cv_sets]),
+        skill_matrix_service.encode_skill_sets([skills for _, skills in job_sets]),
+    )
+    return skill_matrix_service.summarize(
+        matrix, [cv_id for cv_id, _ in cv_sets], [job_id for job_id, _ in job_sets], top_n
+    )
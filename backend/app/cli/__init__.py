@@ -0,0 +1 @@
+"""Command-Line Tools Package"""
@@ -0,0 +1,32 @@
+"""
+Shared CLI helpers
+Loading CV and job documents from disk
+"""
+
+import os
+from typing import List, Tuple
+from app.services.pdf_service import pdf_service
+
+DOCUMENT_EXTENSIONS = (".pdf", ".txt", ".md")
+
+
+def list_documents(directory: str, extensions: Tuple[str, ...] = DOCUMENT_EXTENSIONS) -> List[str]:
+    """Return the paths of supported documents in a directory, sorted by name"""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(extensions) and os.path.isfile(os.path.join(directory, name))
+    )
+
+
+def read_document(path: str) -> str:
+    """
+    Read the text of a PDF or plain-text document
+
+    Raises:
+        ValueError: If a PDF cannot be read
+    """
+    if path.lower().endswith(".pdf"):
+        with open(path, "rb") as f:
+            return pdf_service.extract_text_from_pdf(f.read())
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
@@ -0,0 +1,238 @@
+"""
+Bulk Screening CLI
+Scores a directory of CVs against one job description without the web server
+
+Usage:
+    python -m app.cli.screen --cvs ./cvs --job job.txt --output results.jsonl
+        [--workers 4] [--concurrency 8] [--rate 60]
+
+Text extraction runs in a process pool and LLM calls run concurrently under a
+requests-per-minute limit. Each result is appended to the output (JSONL or
+CSV, by extension) as soon as it is ready, and finished files are recorded in
+a checkpoint file tied to the job description; re-running the same command
+skips them, while a checkpoint written for another job is refused. Exits with
+status 2 if any file failed (LLM failures are retried on the next run).
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Set, Tuple
+from app.cli.common import list_documents, read_document
+from app.core.admission import admission_controller
+from app.core.config import settings
+from app.services.ai_service import ai_service
+from app.utils.rate_limiter import RateLimiter
+
+CSV_FIELDS = ["file", "status", "score", "matching_skills", "missing_skills", "recommendation", "error"]
+
+
+def file_key(path: str) -> str:
+    """Identify a CV by name, size and modification time so edited files are re-screened"""
+    stat = os.stat(path)
+    return f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def extract_file(path: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """Process-pool task: return (path, text, error)"""
+    try:
+        return path, read_document(path), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+class Checkpoint:
+    """
+    Append-only record of finished files
+
+    The first line holds a hash of the job description, so a checkpoint is
+    only resumed for the job it was written for.
+    """
+
+    def __init__(self, path: str, job_description: str):
+        self.path = path
+        self.done: Set[str] = set()
+        header = f"# job {hashlib.sha256(job_description.encode('utf-8')).hexdigest()}"
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not is_new:
+            with open(path, "r", encoding="utf-8") as f:
+                lines = [line.strip() for line in f if line.strip()]
+            if not lines or lines[0] != header:
+                raise ValueError(
+                    f"Checkpoint {path} was written for a different job description; "
+                    "use another --output or --checkpoint"
+                )
+            self.done = set(lines[1:])
+        self._file = open(path, "a", encoding="utf-8")
+        if is_new:
+            self._file.write(header + "\n")
+            self._file.flush()
+
+    def mark(self, key: str) -> None:
+        self._file.write(key + "\n")
+        self._file.flush()
+        self.done.add(key)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ResultWriter:
+    """Appends results to a JSONL or CSV file, flushing after every record"""
+
+    def __init__(self, path: str):
+        self.is_csv = path.lower().endswith(".csv")
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "a", newline="", encoding="utf-8")
+        if self.is_csv:
+            self._writer = csv.DictWriter(self._file, fieldnames=CSV_FIELDS)
+            if is_new:
+                self._writer.writeheader()
+
+    def write(self, record: Dict) -> None:
+        if self.is_csv:
+            row = {field: record.get(field, "") for field in CSV_FIELDS}
+            for field in ("matching_skills", "missing_skills"):
+                row[field] = "; ".join(row[field] or [])
+            self._writer.writerow(row)
+        else:
+            self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class Progress:
+    """Prints throughput and ETA at most once per second"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self._last_print = 0.0
+
+    def update(self, failed: bool = False, force: bool = False) -> None:
+        self.done += 1
+        self.failed += int(failed)
+        now = time.monotonic()
+        if not force and now - self._last_print < 1.0 and self.done < self.total:
+            return
+        self._last_print = now
+        elapsed = max(now - self.started, 1e-9)
+        rate = self.done / elapsed
+        eta = (self.total - self.done) / rate if rate > 0 else 0
+        interactive = sys.stderr.isatty()
+        print(
+            f"{chr(13) if interactive else ''}{self.done}/{self.total} files  {rate:.2f} files/s  "
+            f"ETA {int(eta // 60)}m{int(eta % 60):02d}s  failed {self.failed}",
+            end="" if interactive else "\n", file=sys.stderr, flush=True
+        )
+
+
+async def screen(cv_paths, job_description: str, writer: ResultWriter, checkpoint: Checkpoint,
+                 workers: int, concurrency: int, rate: float) -> Progress:
+    """Extract and analyze CVs, writing each result as it completes"""
+    loop = asyncio.get_running_loop()
+    limiter = RateLimiter(rate, period=60.0, burst=concurrency)
+    llm_slots = asyncio.Semaphore(concurrency)
+    # No web traffic in this process: --concurrency replaces the server's LLM limit
+    admission_controller.set_llm_concurrency(concurrency)
+    # Bound the files in flight so thousands of extracted texts are never held at once
+    in_flight = asyncio.Semaphore(concurrency * 2 + workers)
+    progress = Progress(len(cv_paths))
+
+    async def process(path: str, pool: ProcessPoolExecutor) -> None:
+        key = file_key(path)
+        try:
+            _, text, error = await loop.run_in_executor(pool, extract_file, path)
+            record = {"file": os.path.basename(path)}
+            if error is not None:
+                # Extraction failures are deterministic: record them and move on
+                writer.write({**record, "status": "error", "error": error})
+                checkpoint.mark(key)
+                progress.update(failed=True)
+                return
+
+            async with llm_slots:
+                await limiter.acquire()
+                try:
+                    result = await ai_service.analyze_resume(text, job_description, background=True)
+                except Exception as e:
+                    # Not checkpointed, so a later run retries the file
+                    print(f"\nAnalysis failed for {path}: {e}", file=sys.stderr)
+                    progress.update(failed=True)
+                    return
+
+            writer.write({**record, "status": "ok", **result})
+            checkpoint.mark(key)
+            progress.update()
+        finally:
+            in_flight.release()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        tasks = []
+        for path in cv_paths:
+            await in_flight.acquire()
+            tasks.append(asyncio.create_task(process(path, pool)))
+        await asyncio.gather(*tasks)
+    return progress
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Score a directory of CVs against a job description")
+    parser.add_argument("--cvs", required=True, help="Directory of CVs (.pdf, .txt, .md)")
+    parser.add_argument("--job", required=True, help="Job description file (.txt, .md or .pdf)")
+    parser.add_argument("--output", default="results.jsonl", help="Results file (.jsonl or .csv)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--workers", type=int, default=settings.worker_count,
+                        help="Processes used for text extraction")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent LLM calls")
+    parser.add_argument("--rate", type=float, default=60.0, help="Maximum LLM calls per minute (0 = unlimited)")
+    args = parser.parse_args(argv)
+
+    job_description = read_document(args.job)
+    try:
+        checkpoint = Checkpoint(args.checkpoint or f"{args.output}.checkpoint", job_description)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    all_paths = list_documents(args.cvs)
+    cv_paths = [path for path in all_paths if file_key(path) not in checkpoint.done]
+    skipped = len(all_paths) - len(cv_paths)
+    print(f"{len(cv_paths)} CVs to screen ({skipped} already done) with "
+          f"{ai_service.provider_class.__name__}", file=sys.stderr)
+    if not cv_paths:
+        checkpoint.close()
+        return 0
+
+    writer = ResultWriter(args.output)
+    try:
+        progress = asyncio.run(screen(
+            cv_paths, job_description, writer, checkpoint,
+            max(1, args.workers), max(1, args.concurrency), args.rate
+        ))
+    except KeyboardInterrupt:
+        print("\nInterrupted; run the same command again to resume", file=sys.stderr)
+        return 130
+    finally:
+        writer.close()
+        checkpoint.close()
+        admission_controller.shutdown()
+
+    elapsed = time.monotonic() - progress.started
+    print(f"\nScreened {progress.done} CVs in {elapsed:.1f}s "
+          f"({progress.done / max(elapsed, 1e-9):.2f} files/s), {progress.failed} failed; "
+          f"results in {args.output}", file=sys.stderr)
+    return 0 if progress.failed == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Skill Matrix CLI
+Scores every CV in a directory against every job description in another
+
+Usage:
+    python -m app.cli.skill_matrix --cvs ./cvs --jobs ./jobs [--output matrix.csv] [--top 5]
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from typing import List, Tuple
+from app.cli.common import list_documents, read_document
+from app.services.skill_matrix import skill_matrix_service
+
+
+def read_documents(paths: List[str]) -> Tuple[List[str], List[str]]:
+    """Read documents, skipping unreadable ones; returns (texts, file names)"""
+    texts, names = [], []
+    for path in paths:
+        try:
+            texts.append(read_document(path))
+            names.append(os.path.basename(path))
+        except ValueError as e:
+            print(f"Skipping {path}: {e}", file=sys.stderr)
+    return texts, names
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk keyword match of CVs against job descriptions")
+    parser.add_argument("--cvs", required=True, help="Directory of CVs (.pdf, .txt, .md)")
+    parser.add_argument("--jobs", required=True, help="Directory of job descriptions (.pdf, .txt, .md)")
+    parser.add_argument("--output", help="Write the CV x job score matrix to this CSV file")
+    parser.add_argument("--top", type=int, default=5, help="Best candidates printed per job")
+    args = parser.parse_args(argv)
+
+    cv_paths = list_documents(args.cvs)
+    job_paths = list_documents(args.jobs)
+    if not cv_paths or not job_paths:
+        print("No CVs or job descriptions found", file=sys.stderr)
+        return 1
+
+    cv_texts, cv_names = read_documents(cv_paths)
+    job_texts, job_names = read_documents(job_paths)
+    if not cv_texts or not job_texts:
+        print("No readable CVs or job descriptions", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    matrix = skill_matrix_service.match_texts(cv_texts, job_texts)
+    elapsed = time.perf_counter() - started
+    scores = matrix.scores
+
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["cv"] + job_names)
+            for name, row in zip(cv_names, scores):
+                writer.writerow([name] + [f"{score:.1f}" for score in row])
+
+    for j, job_name in enumerate(job_names):
+        print(f"\n{job_name} ({int(matrix.required[j])} required skills)")
+        for i in matrix.top_cvs(j, args.top):
+            missing = ", ".join(matrix.missing_skills(i, j)) or "-"
+            print(f"  {scores[i, j]:5.1f}  {cv_names[i]}  missing: {missing}")
+
+    print(f"\nMatched {len(cv_names)} CVs x {len(job_names)} jobs in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+"""
+Admission Control
+Per-tenant and global concurrency limits with bounded, deadline-aware queues
+"""
+
+import asyncio
+import functools
+import math
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Deque, Dict, Optional
+from fastapi import HTTPException, Request, status
+from app.core.config import settings
+from app.utils.logger import logger
+
+
+class AdmissionRejected(HTTPException):
+    """Raised when a request cannot be admitted in time (rendered with Retry-After)"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: float):
+        super().__init__(
+            status_code=status_code,
+            detail=detail,
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))}
+        )
+
+
+def tenant_key(request: Request) -> str:
+    """
+    Identity a request is admitted under
+
+    An X-API-Key header only selects a tenant when the key is listed in
+    API_KEYS, so a client cannot dodge its limit by inventing keys. Everyone
+    else is keyed by client address, which uvicorn takes from X-Forwarded-For
+    when the connecting proxy is listed in FORWARDED_ALLOW_IPS.
+    """
+    api_key = request.headers.get("X-API-Key")
+    if api_key and api_key in settings.api_keys_set:
+        return f"key:{api_key}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+class WaitStats:
+    """Queue wait-time statistics over a sliding window"""
+
+    def __init__(self, window: int = 1000):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+        self.max = max(self.max, seconds)
+
+    def snapshot(self) -> Dict[str, float]:
+        samples = sorted(self._samples)
+        if not samples:
+            return {"count": 0, "mean_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        return {
+            "count": self.count,
+            "mean_ms": round(sum(samples) / len(samples) * 1000, 1),
+            "p95_ms": round(samples[int(0.95 * (len(samples) - 1))] * 1000, 1),
+            "max_ms": round(self.max * 1000, 1),
+        }
+
+
+class ConcurrencyLimit:
+    """
+    Counting semaphore with a bounded FIFO wait queue
+
+    A caller is rejected up front when the queue is full or when the expected
+    wait (queue position x average hold time / limit) exceeds its deadline,
+    rather than piling up until it times out. A deadline of math.inf waits
+    for as long as it takes and is never rejected (background work).
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, reject_status: int, busy_message: str):
+        self.name = name
+        self.busy_message = busy_message
+        self.limit = max(1, limit)
+        self.max_queue = max_queue
+        self.reject_status = reject_status
+        self.active = 0
+        self.rejected = 0
+        self.wait_stats = WaitStats()
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._hold_time: Optional[float] = None  # EWMA of seconds a slot is held
+
+    @property
+    def waiting(self) -> int:
+        """Current queue depth"""
+        return len(self._waiters)
+
+    def estimated_wait(self) -> float:
+        """Expected seconds until a new caller would get a slot"""
+        if self.active < self.limit and not self._waiters:
+            return 0.0
+        hold_time = self._hold_time if self._hold_time is not None else 1.0
+        return (len(self._waiters) + 1) * hold_time / self.limit
+
+    def _reject(self, reason: str) -> None:
+        self.rejected += 1
+        retry_after = self.estimated_wait()
+        logger.warning(f"Admission rejected ({self.name}): {reason}")
+        raise AdmissionRejected(self.reject_status, f"{self.busy_message}: {reason}", retry_after)
+
+    async def acquire(self, deadline: float) -> float:
+        """
+        Wait for a slot until the deadline
+
+        Args:
+            deadline: time.monotonic() value after which the caller gives up
+                (math.inf to wait without limit)
+
+        Returns:
+            Monotonic time at which the slot was granted
+
+        Raises:
+            AdmissionRejected: If the queue is full or the deadline cannot be met
+        """
+        started = time.monotonic()
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.wait_stats.record(0.0)
+            return started
+
+        bounded = math.isfinite(deadline)
+        if bounded and len(self._waiters) >= self.max_queue:
+            self._reject("queue full")
+        remaining = deadline - started
+        if bounded and self.estimated_wait() > remaining:
+            self._reject("expected wait exceeds deadline")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=remaining if bounded else None)
+        except asyncio.TimeoutError:
+            self._reject("timed out in queue")
+        except asyncio.CancelledError:
+            # Caller went away after being handed a slot: pass it on
+            if waiter.done() and not waiter.cancelled():
+                self.release(time.monotonic())
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+        granted = time.monotonic()
+        self.wait_stats.record(granted - started)
+        return granted
+
+    def release(self, granted_at: float) -> None:
+        """Free a slot and hand it to the next waiter"""
+        hold_time = time.monotonic() - granted_at
+        self._hold_time = hold_time if self._hold_time is None else 0.8 * self._hold_time + 0.2 * hold_time
+        self.active -= 1
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+                break
+
+    @asynccontextmanager
+    async def slot(self, deadline: Optional[float] = None):
+        """Hold a slot for the duration of the block"""
+        if deadline is None:
+            deadline = time.monotonic() + settings.ADMISSION_MAX_WAIT
+        granted_at = await self.acquire(deadline)
+        try:
+            yield
+        finally:
+            self.release(granted_at)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+            "wait": self.wait_stats.snapshot(),
+        }
+
+
+class AdmissionController:
+    """
+    Admission control for analysis requests
+
+    A request first takes a slot from its tenant's limit (429 when that tenant
+    is saturated) and then from the global limit (503 when the worker is).
+    Inside, CPU-bound PDF work and I/O-bound LLM calls draw from separate
+    limits and run on separate executors (neither uses the event loop's
+    default executor), so a burst of large PDFs cannot starve LLM calls and
+    vice versa.
+    """
+
+    def __init__(self):
+        self.global_limit = ConcurrencyLimit(
+            "global", settings.ADMISSION_GLOBAL_LIMIT, settings.ADMISSION_MAX_QUEUE,
+            status.HTTP_503_SERVICE_UNAVAILABLE, "Server busy"
+        )
+        self.pdf_limit = ConcurrencyLimit(
+            "pdf", max(1, settings.PDF_POOL_SIZE), settings.ADMISSION_MAX_QUEUE,
+            status.HTTP_503_SERVICE_UNAVAILABLE, "PDF extraction busy"
+        )
+        self.llm_limit = ConcurrencyLimit(
+            "llm", settings.LLM_CONCURRENCY, settings.ADMISSION_MAX_QUEUE,
+            status.HTTP_503_SERVICE_UNAVAILABLE, "Analysis capacity busy"
+        )
+        self.tenants: Dict[str, ConcurrencyLimit] = {}
+        self.tenant_rejections = 0
+        self._pdf_executor: Optional[Executor] = None
+        self._llm_executor: Optional[Executor] = None
+
+    def _tenant(self, key: str) -> ConcurrencyLimit:
+        if key not in self.tenants:
+            self.tenants[key] = ConcurrencyLimit(
+                "tenant", settings.ADMISSION_PER_KEY_LIMIT, settings.ADMISSION_PER_KEY_QUEUE,
+                status.HTTP_429_TOO_MANY_REQUESTS, "Too many concurrent requests for this API key"
+            )
+        return self.tenants[key]
+
+    @asynccontextmanager
+    async def admit(self, key: str):
+        """
+        Admit one request for a tenant
+
+        Args:
+            key: Tenant identity (API key or client address)
+
+        Raises:
+            AdmissionRejected: 429 if the tenant is over its limit, 503 if the worker is
+        """
+        deadline = time.monotonic() + settings.ADMISSION_MAX_WAIT
+        tenant = self._tenant(key)
+        try:
+            async with tenant.slot(deadline):
+                async with self.global_limit.slot(deadline):
+                    yield
+        except AdmissionRejected as e:
+            if e.status_code == status.HTTP_429_TOO_MANY_REQUESTS:
+                self.tenant_rejections += 1
+            raise
+        finally:
+            if tenant.active == 0 and tenant.waiting == 0:
+                self.tenants.pop(key, None)
+
+    @property
+    def pdf_executor(self) -> Executor:
+        """Pool for PDF work, created lazily in each worker (a single thread when PDF_POOL_SIZE is 0)"""
+        if self._pdf_executor is None:
+            if settings.PDF_POOL_SIZE > 0:
+                self._pdf_executor = ProcessPoolExecutor(max_workers=settings.PDF_POOL_SIZE)
+            else:
+                self._pdf_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf")
+        return self._pdf_executor
+
+    @property
+    def llm_executor(self) -> Executor:
+        """Threads for blocking provider SDK calls, one per LLM slot"""
+        if self._llm_executor is None:
+            self._llm_executor = ThreadPoolExecutor(
+                max_workers=self.llm_limit.limit, thread_name_prefix="llm"
+            )
+        return self._llm_executor
+
+    async def run_pdf(self, func: Callable, *args: Any) -> Any:
+        """Run a CPU-bound PDF function on the PDF executor under the PDF limit"""
+        async with self.pdf_limit.slot():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pdf_executor, func, *args)
+
+    async def run_llm(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking provider SDK call on the LLM executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.llm_executor, functools.partial(func, *args, **kwargs))
+
+    def llm_slot(self, background: bool = False):
+        """
+        Context manager holding one of the LLM call slots
+
+        Request handlers are rejected (503) when no slot frees up within
+        ADMISSION_MAX_WAIT; background work (corpus re-analysis, offline
+        tools) queues until a slot is available.
+        """
+        return self.llm_limit.slot(math.inf if background else None)
+
+    def set_llm_concurrency(self, limit: int) -> None:
+        """Resize the LLM limit, for offline tools that own the whole process"""
+        self.llm_limit.limit = max(1, limit)
+        if self._llm_executor is not None:
+            self._llm_executor.shutdown(wait=False)
+            self._llm_executor = None
+
+    def shutdown(self) -> None:
+        """Stop the PDF and LLM executors"""
+        for executor in (self._pdf_executor, self._llm_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._pdf_executor = None
+        self._llm_executor = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Queue depth, wait-time and rejection metrics for this worker"""
+        return {
+            "global": self.global_limit.snapshot(),
+            "pdf": self.pdf_limit.snapshot(),
+            "llm": self.llm_limit.snapshot(),
+            "tenants": {
+                "active": len(self.tenants),
+                "per_key_limit": settings.ADMISSION_PER_KEY_LIMIT,
+                "queue_depth": sum(t.waiting for t in self.tenants.values()),
+                "rejected": self.tenant_rejections,
+            },
+        }
+
+
+# Create global instance
+admission_controller = AdmissionController()
@@ -3,11 +3,38 @@ Application Configuration
 Centralizes all environment variables and settings
 """
 
-from typing import List
+import math
+import os
+from typing import List, Optional, Set
 from pydantic_settings import BaseSettings
 from pydantic import Field, field_validator
 
 
+def cgroup_cpu_limit(root: str = "/sys/fs/cgroup") -> Optional[int]:
+    """
+    CPU quota of this container, rounded up (None when unlimited or unknown)
+
+    Reads cgroup v2 cpu.max, falling back to cgroup v1 cfs quota/period.
+    """
+    candidates = [
+        (os.path.join(root, "cpu.max"), None),
+        (os.path.join(root, "cpu", "cpu.cfs_quota_us"), os.path.join(root, "cpu", "cpu.cfs_period_us")),
+    ]
+    for quota_path, period_path in candidates:
+        try:
+            with open(quota_path) as f:
+                fields = f.read().split()
+            if period_path is not None:
+                with open(period_path) as f:
+                    fields.append(f.read().strip())
+        except OSError:
+            continue
+        if len(fields) < 2 or fields[0] in ("max", "-1"):
+            return None
+        return max(1, math.ceil(int(fields[0]) / int(fields[1])))
+    return None
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables"""
     
@@ -29,6 +56,18 @@ class Settings(BaseSettings):
     AI_MAX_TOKENS: int = Field(default=1000, env="AI_MAX_TOKENS")
     AI_TEMPERATURE: float = Field(default=0.3, env="AI_TEMPERATURE")
     
+    # Model tiering and output token budgeting
+    AI_FAST_MODEL: str = Field(default="", env="AI_FAST_MODEL")  # empty = single tier (AI_MODEL)
+    AI_MIN_OUTPUT_TOKENS: int = Field(default=400, env="AI_MIN_OUTPUT_TOKENS")
+    AI_OUTPUT_TOKENS_PER_INPUT_TOKEN: float = Field(default=0.25, env="AI_OUTPUT_TOKENS_PER_INPUT_TOKEN")
+    AI_FAST_MAX_INPUT_TOKENS: int = Field(default=600, env="AI_FAST_MAX_INPUT_TOKENS")
+    AI_CLEAR_LOW_SCORE: float = Field(default=30.0, env="AI_CLEAR_LOW_SCORE")
+    AI_CLEAR_HIGH_SCORE: float = Field(default=90.0, env="AI_CLEAR_HIGH_SCORE")
+    AI_BORDERLINE_LOW: float = Field(default=45.0, env="AI_BORDERLINE_LOW")
+    AI_BORDERLINE_HIGH: float = Field(default=75.0, env="AI_BORDERLINE_HIGH")
+    AI_COST_PER_1K_TOKENS: float = Field(default=0.03, env="AI_COST_PER_1K_TOKENS")
+    AI_FAST_COST_PER_1K_TOKENS: float = Field(default=0.002, env="AI_FAST_COST_PER_1K_TOKENS")
+    
     # File Upload Limits
     MAX_FILE_SIZE_MB: int = Field(default=10, env="MAX_FILE_SIZE_MB")
     ALLOWED_EXTENSIONS: str = Field(default="pdf", env="ALLOWED_EXTENSIONS")
@@ -36,6 +75,49 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = Field(default="INFO", env="LOG_LEVEL")
     
+    # Production server (gunicorn + uvicorn workers)
+    WEB_CONCURRENCY: int = Field(default=0, env="WEB_CONCURRENCY")  # 0 = derive from CPU count
+    MAX_WORKERS: int = Field(default=8, env="MAX_WORKERS")
+    SHUTDOWN_DRAIN_TIMEOUT: float = Field(default=30.0, env="SHUTDOWN_DRAIN_TIMEOUT")
+    FORWARDED_ALLOW_IPS: str = Field(default="127.0.0.1", env="FORWARDED_ALLOW_IPS")  # proxies trusted for X-Forwarded-For
+    
+    # Admission control (per worker)
+    API_KEYS: str = Field(default="", env="API_KEYS")  # comma-separated keys that get their own tenant
+    ADMISSION_GLOBAL_LIMIT: int = Field(default=16, env="ADMISSION_GLOBAL_LIMIT")
+    ADMISSION_PER_KEY_LIMIT: int = Field(default=4, env="ADMISSION_PER_KEY_LIMIT")
+    ADMISSION_PER_KEY_QUEUE: int = Field(default=8, env="ADMISSION_PER_KEY_QUEUE")
+    ADMISSION_MAX_QUEUE: int = Field(default=64, env="ADMISSION_MAX_QUEUE")
+    ADMISSION_MAX_WAIT: float = Field(default=10.0, env="ADMISSION_MAX_WAIT")  # seconds
+    PDF_POOL_SIZE: int = Field(default=1, env="PDF_POOL_SIZE")  # processes; 0 = one dedicated thread
+    LLM_CONCURRENCY: int = Field(default=8, env="LLM_CONCURRENCY")
+    
+    # Analysis cache shared across workers
+    CACHE_BACKEND: str = Field(default="memory", env="CACHE_BACKEND")  # memory, sqlite, none
+    CACHE_PATH: str = Field(default="smartresume-cache.db", env="CACHE_PATH")
+    CACHE_TTL_SECONDS: int = Field(default=86400, env="CACHE_TTL_SECONDS")
+    
+    # Candidate ranking (local embedding index)
+    EMBEDDING_BACKEND: str = Field(default="hashing", env="EMBEDDING_BACKEND")  # hashing, sentence-transformers
+    EMBEDDING_MODEL: str = Field(default="all-MiniLM-L6-v2", env="EMBEDDING_MODEL")
+    EMBEDDING_DIM: int = Field(default=2048, env="EMBEDDING_DIM")  # hashing buckets
+    INDEX_DIR: str = Field(default="data/index", env="INDEX_DIR")
+    INDEX_CHUNK_WORDS: int = Field(default=200, env="INDEX_CHUNK_WORDS")
+    INDEX_CHUNK_OVERLAP: int = Field(default=40, env="INDEX_CHUNK_OVERLAP")
+    INDEX_INITIAL_CAPACITY: int = Field(default=1024, env="INDEX_INITIAL_CAPACITY")
+    RANK_MAX_TOP_K: int = Field(default=50, env="RANK_MAX_TOP_K")
+    RANK_ANALYZE_CONCURRENCY: int = Field(default=5, env="RANK_ANALYZE_CONCURRENCY")
+    
+    # Candidate/job corpus
+    CORPUS_PATH: str = Field(default="data/corpus.db", env="CORPUS_PATH")
+    CORPUS_BATCH_SIZE: int = Field(default=5, env="CORPUS_BATCH_SIZE")
+    CORPUS_LEASE_SECONDS: float = Field(default=600.0, env="CORPUS_LEASE_SECONDS")  # before a claimed pair is retried
+    RESCORE_LLM_THRESHOLD: float = Field(default=10.0, env="RESCORE_LLM_THRESHOLD")
+    
+    # CV parsing
+    CV_PARSE_CACHE_SIZE: int = Field(default=512, env="CV_PARSE_CACHE_SIZE")
+    AI_SECTION_PROMPTS: bool = Field(default=True, env="AI_SECTION_PROMPTS")
+    AI_MAX_CV_CHARS: int = Field(default=12000, env="AI_MAX_CV_CHARS")
+    
     @property
     def cors_origins_list(self) -> List[str]:
         """Convert CORS_ORIGINS string to list"""
@@ -46,6 +128,32 @@ class Settings(BaseSettings):
         """Convert ALLOWED_EXTENSIONS string to list"""
         return [ext.strip() for ext in self.ALLOWED_EXTENSIONS.split(",")]
     
+    @property
+    def api_keys_set(self) -> Set[str]:
+        """Convert API_KEYS string to a set"""
+        return {key.strip() for key in self.API_KEYS.split(",") if key.strip()}
+    
+    @property
+    def worker_count(self) -> int:
+        """
+        Number of server worker processes
+        
+        Uses WEB_CONCURRENCY when set, otherwise one worker per CPU available
+        to this process (PDF extraction is CPU-bound), capped at MAX_WORKERS.
+        Available CPUs honour both the affinity mask and a container's cgroup
+        CPU quota, which sched_getaffinity alone does not see.
+        """
+        if self.WEB_CONCURRENCY > 0:
+            return self.WEB_CONCURRENCY
+        try:
+            cpus = len(os.sched_getaffinity(0))
+        except AttributeError:
+            cpus = os.cpu_count() or 1
+        quota = cgroup_cpu_limit()
+        if quota is not None:
+            cpus = min(cpus, quota)
+        return max(1, min(cpus, self.MAX_WORKERS))
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
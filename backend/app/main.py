@@ -3,10 +3,14 @@ SmartResume Analyzer - Main FastAPI Application
 Entry point for the backend API server
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import analyze
+from fastapi.responses import JSONResponse
+from app.api import analyze, corpus, ranking, skills
+from app.core.admission import admission_controller
 from app.core.config import settings
+from app.services.ai_service import ai_service
+from app.services.model_policy import model_policy
 from app.utils.logger import logger
 
 # Initialize FastAPI application
@@ -29,6 +33,9 @@ app.add_middleware(
 
 # Include API routers
 app.include_router(analyze.router, prefix="/api", tags=["Analysis"])
+app.include_router(ranking.router, prefix="/api", tags=["Ranking"])
+app.include_router(corpus.router, prefix="/api", tags=["Corpus"])
+app.include_router(skills.router, prefix="/api", tags=["Skills"])
 
 
 @app.on_event("startup")
@@ -37,12 +44,17 @@ async def startup_event():
     logger.info(f"Starting {settings.APP_NAME} v1.0.0")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"AI Provider: {settings.AI_PROVIDER}")
+    # Build the provider client in the background so /health answers immediately
+    ai_service.start_warm_up()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on application shutdown"""
     logger.info(f"Shutting down {settings.APP_NAME}")
+    # Let in-flight LLM calls finish before the worker exits
+    await ai_service.drain(settings.SHUTDOWN_DRAIN_TIMEOUT)
+    admission_controller.shutdown()
 
 
 @app.get("/", tags=["Health"])
@@ -58,11 +70,28 @@ async def root():
 
 @app.get("/health", tags=["Health"])
 async def health_check():
-    """Detailed health check endpoint"""
-    return {
-        "status": "healthy",
-        "checks": {
-            "api": "operational",
-            "ai_service": "configured" if settings.AI_API_KEY else "missing_key",
+    """Detailed health check endpoint (503 while the AI provider failed to initialize)"""
+    degraded = ai_service.warmup_status == "failed"
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE if degraded else status.HTTP_200_OK,
+        content={
+            "status": "degraded" if degraded else "healthy",
+            "checks": {
+                "api": "operational",
+                "ai_service": "configured" if settings.AI_API_KEY else "missing_key",
+                "ai_provider": ai_service.warmup_status,
+            }
         }
+    )
+
+
+@app.get("/metrics", tags=["Health"])
+async def metrics():
+    """Admission control metrics for this worker: queue depth, wait times, rejections"""
+    return {
+        "admission": admission_controller.snapshot(),
+        "ai_service": {
+            "in_flight": ai_service.in_flight,
+            "tiers": model_policy.stats.snapshot(),
+        },
     }
@@ -0,0 +1,62 @@
+"""
+Pydantic Schemas for the Candidate/Job Corpus
+Data validation and serialization models for stored CVs, jobs and results
+"""
+
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class StoredCV(BaseModel):
+    """A parsed CV kept in the corpus"""
+    id: int = Field(..., description="CV id")
+    filename: str = Field(..., description="Original file name")
+    content_hash: str = Field(..., description="SHA-256 of the extracted text")
+    skills: List[str] = Field(default_factory=list, description="Skills extracted locally")
+    created: bool = Field(..., description="False if the same CV text was already stored")
+
+
+class JobRequest(BaseModel):
+    """Request schema for creating or editing a job"""
+    title: str = Field(..., description="Job title", min_length=1, max_length=200)
+    description: str = Field(
+        ...,
+        description="Job description text",
+        min_length=10,
+        max_length=5000
+    )
+
+
+class JobResponse(BaseModel):
+    """A job description kept in the corpus"""
+    id: int = Field(..., description="Job id")
+    title: str = Field(..., description="Job title")
+    description: str = Field(..., description="Job description text")
+    requirements: List[str] = Field(default_factory=list, description="Skills required by the job")
+    version: int = Field(..., description="Incremented on every edit")
+
+
+class JobUpdateResponse(BaseModel):
+    """Response schema for a job edit"""
+    job: JobResponse
+    added_requirements: List[str] = Field(default_factory=list)
+    removed_requirements: List[str] = Field(default_factory=list)
+    unchanged: int = Field(..., description="Pairs whose results are still valid")
+    local: int = Field(..., description="Pairs re-scored locally from the skill delta")
+    queued: int = Field(..., description="Pairs queued for LLM re-analysis")
+
+
+class PairResult(BaseModel):
+    """Analysis of one CV against one job"""
+    cv_id: int
+    filename: str
+    job_version: int
+    status: str = Field(..., description="fresh, local, queued or running")
+    score: float = Field(..., description="LLM score, or local keyword score while queued")
+    analysis: Optional[dict] = Field(None, description="Latest analysis result")
+
+
+class JobResultsResponse(BaseModel):
+    """Response schema for a job's results"""
+    job: JobResponse
+    results: List[PairResult] = Field(default_factory=list)
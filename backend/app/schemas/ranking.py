@@ -0,0 +1,61 @@
+"""
+Pydantic Schemas for Candidate Ranking
+Data validation and serialization models for the candidate index
+"""
+
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from app.core.config import settings
+from app.schemas.analysis import AnalysisResponse
+
+
+class IndexedCandidate(BaseModel):
+    """A CV stored in the candidate index"""
+    id: int = Field(..., description="Candidate id in the index")
+    filename: str = Field(..., description="Original file name")
+    chunks: int = Field(..., description="Number of embedded text chunks")
+    created: bool = Field(..., description="False if the same CV text was already indexed")
+
+
+class IndexResponse(BaseModel):
+    """Response schema for candidate uploads"""
+    candidates: List[IndexedCandidate] = Field(default_factory=list)
+    total_indexed: int = Field(..., description="Number of CVs in the index")
+
+
+class RankingRequest(BaseModel):
+    """Request schema for ranking indexed candidates against a job"""
+    job_description: str = Field(
+        ...,
+        description="Job description to rank candidates against",
+        min_length=10,
+        max_length=5000
+    )
+    top_k: int = Field(
+        default=10,
+        ge=1,
+        le=settings.RANK_MAX_TOP_K,
+        description="Number of candidates to return"
+    )
+    analyze: bool = Field(
+        default=False,
+        description="Run the full AI analysis on the returned candidates"
+    )
+
+
+class RankedCandidate(BaseModel):
+    """A candidate in the ranked shortlist"""
+    id: int = Field(..., description="Candidate id in the index")
+    filename: str = Field(..., description="Original file name")
+    similarity: float = Field(..., description="Cosine similarity to the job description")
+    analysis: Optional[AnalysisResponse] = Field(
+        None,
+        description="AI analysis, when requested"
+    )
+    error: Optional[str] = Field(None, description="AI analysis error, if any")
+
+
+class RankingResponse(BaseModel):
+    """Response schema for candidate ranking"""
+    candidates: List[RankedCandidate] = Field(default_factory=list)
+    total_indexed: int = Field(..., description="Number of CVs searched")
@@ -0,0 +1,44 @@
+"""
+Pydantic Schemas for Bulk Skill Matching
+Data validation and serialization models for the skill matrix
+"""
+
+from typing import List, Union
+from pydantic import BaseModel, Field
+
+
+class MatrixDocument(BaseModel):
+    """A CV or job description to include in the matrix"""
+    id: Union[int, str] = Field(..., description="Caller-chosen identifier")
+    text: str = Field(..., description="CV or job description text", min_length=1)
+
+
+class SkillMatrixRequest(BaseModel):
+    """Request schema for a bulk skill matrix"""
+    cvs: List[MatrixDocument] = Field(..., min_length=1, description="CV texts")
+    jobs: List[MatrixDocument] = Field(..., min_length=1, description="Job description texts")
+    top_n: int = Field(default=5, ge=0, le=100, description="Best candidates listed per job")
+
+
+class MatrixCandidate(BaseModel):
+    """A CV in a job's best-match list"""
+    cv_id: Union[int, str]
+    score: float
+    matching_skills: List[str] = Field(default_factory=list)
+    missing_skills: List[str] = Field(default_factory=list)
+
+
+class JobBestMatches(BaseModel):
+    """Best-covering CVs for one job"""
+    job_id: Union[int, str]
+    candidates: List[MatrixCandidate] = Field(default_factory=list)
+
+
+class SkillMatrixResponse(BaseModel):
+    """Response schema for a bulk skill matrix (rows are CVs, columns are jobs)"""
+    cv_ids: List[Union[int, str]]
+    job_ids: List[Union[int, str]]
+    scores: List[List[float]] = Field(..., description="Keyword match score 0-100 per pair")
+    coverage: List[List[float]] = Field(..., description="Fraction of job requirements met per pair")
+    missing_counts: List[List[int]] = Field(..., description="Number of job requirements missing per pair")
+    best_matches: List[JobBestMatches] = Field(default_factory=list)
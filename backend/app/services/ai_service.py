@@ -3,25 +3,51 @@ AI Service
 Abstraction layer for LLM integration (OpenAI, Anthropic, or Mock)
 """
 
+import asyncio
+import importlib
 import json
-from typing import Dict, Any
+import re
+import threading
+import time
+from typing import Dict, Any, Optional, Type
 from abc import ABC, abstractmethod
+from app.core.admission import admission_controller
 from app.core.config import settings
+from app.services.cache_service import cache_service
+from app.services.cv_parser import cv_parser
+from app.services.model_policy import RoutingDecision, estimate_tokens, model_policy
+from app.services.skill_service import skill_service
 from app.utils.logger import logger
 
 
+class TruncatedResponseError(Exception):
+    """Raised by a provider when the model stopped at its output token limit"""
+
+
 class BaseAIProvider(ABC):
     """Abstract base class for AI providers"""
     
+    # SDK module imported by the provider constructor (None if no SDK is needed)
+    sdk_module: Optional[str] = None
+    # Extra output tokens the model spends before answering (e.g. thinking)
+    output_token_overhead: int = 0
+    
+    def output_overhead(self, model: Optional[str] = None) -> int:
+        """Output tokens to reserve on top of the answer budget for a model"""
+        return self.output_token_overhead
+    
     @abstractmethod
-    async def analyze_cv(self, cv_text: str, job_description: str) -> Dict[str, Any]:
-        """Analyze CV against job description"""
+    async def analyze_cv(self, cv_text: str, job_description: str,
+                         model: Optional[str] = None, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Analyze CV against job description (model and max_tokens default to settings)"""
         pass
 
 
 class OpenAIProvider(BaseAIProvider):
     """OpenAI GPT-4 implementation"""
     
+    sdk_module = "openai"
+    
     def __init__(self):
         try:
             import openai
@@ -30,13 +56,16 @@ class OpenAIProvider(BaseAIProvider):
         except ImportError:
             raise ImportError("openai package not installed. Run: pip install openai")
     
-    async def analyze_cv(self, cv_text: str, job_description: str) -> Dict[str, Any]:
+    async def analyze_cv(self, cv_text: str, job_description: str,
+                         model: Optional[str] = None, max_tokens: Optional[int] = None) -> Dict[str, Any]:
         """Analyze CV using OpenAI GPT-4"""
         prompt = self._create_analysis_prompt(cv_text, job_description)
         
         try:
-            response = self.client.chat.completions.create(
-                model=settings.AI_MODEL,
+            # The SDK client is synchronous; run it on the dedicated LLM threads
+            response = await admission_controller.run_llm(
+                self.client.chat.completions.create,
+                model=model or settings.AI_MODEL,
                 messages=[
                     {
                         "role": "system",
@@ -48,10 +77,12 @@ class OpenAIProvider(BaseAIProvider):
                     }
                 ],
                 temperature=settings.AI_TEMPERATURE,
-                max_tokens=settings.AI_MAX_TOKENS,
+                max_tokens=max_tokens or settings.AI_MAX_TOKENS,
                 response_format={"type": "json_object"}
             )
             
+            if response.choices[0].finish_reason == "length":
+                raise TruncatedResponseError("OpenAI response hit max_tokens")
             result = json.loads(response.choices[0].message.content)
             logger.info("Successfully analyzed CV with OpenAI")
             return result
@@ -88,6 +119,8 @@ Be specific, actionable, and constructive in your analysis.
 class AnthropicProvider(BaseAIProvider):
     """Anthropic Claude implementation"""
     
+    sdk_module = "anthropic"
+    
     def __init__(self):
         try:
             import anthropic
@@ -96,14 +129,16 @@ class AnthropicProvider(BaseAIProvider):
         except ImportError:
             raise ImportError("anthropic package not installed. Run: pip install anthropic")
     
-    async def analyze_cv(self, cv_text: str, job_description: str) -> Dict[str, Any]:
+    async def analyze_cv(self, cv_text: str, job_description: str,
+                         model: Optional[str] = None, max_tokens: Optional[int] = None) -> Dict[str, Any]:
         """Analyze CV using Anthropic Claude"""
         prompt = self._create_analysis_prompt(cv_text, job_description)
         
         try:
-            response = self.client.messages.create(
-                model=settings.AI_MODEL or "claude-3-5-sonnet-20241022",
-                max_tokens=settings.AI_MAX_TOKENS,
+            response = await admission_controller.run_llm(
+                self.client.messages.create,
+                model=model or settings.AI_MODEL or "claude-3-5-sonnet-20241022",
+                max_tokens=max_tokens or settings.AI_MAX_TOKENS,
                 temperature=settings.AI_TEMPERATURE,
                 messages=[
                     {
@@ -113,6 +148,9 @@ class AnthropicProvider(BaseAIProvider):
                 ]
             )
             
+            if response.stop_reason == "max_tokens":
+                raise TruncatedResponseError("Anthropic response hit max_tokens")
+            
             # Extract JSON from response
             content = response.content[0].text
             # Try to find JSON in the response
@@ -159,6 +197,11 @@ Be specific, actionable, and constructive in your analysis. Return ONLY valid JS
 class GeminiProvider(BaseAIProvider):
     """Google Gemini implementation"""
     
+    sdk_module = "google.genai"
+    # Gemini 2.5+ models count thinking tokens against max_output_tokens;
+    # this is also passed as the thinking budget so thinking stays within it
+    output_token_overhead = 2048
+    
     def __init__(self):
         try:
             from google import genai
@@ -171,21 +214,44 @@ class GeminiProvider(BaseAIProvider):
         except ImportError:
             raise ImportError("google-genai package not installed. Run: pip install google-genai")
     
-    async def analyze_cv(self, cv_text: str, job_description: str) -> Dict[str, Any]:
+    @staticmethod
+    def supports_thinking(model: str) -> bool:
+        """Whether a Gemini model thinks (2.5 and later); 2.0 and 1.5 models reject a thinking config"""
+        match = re.search(r"gemini-(\d+(?:\.\d+)?)", model)
+        return match is not None and float(match.group(1)) >= 2.5
+    
+    def output_overhead(self, model: Optional[str] = None) -> int:
+        """Thinking budget for thinking models, nothing otherwise"""
+        return self.output_token_overhead if self.supports_thinking(model or self.model_name) else 0
+    
+    async def analyze_cv(self, cv_text: str, job_description: str,
+                         model: Optional[str] = None, max_tokens: Optional[int] = None) -> Dict[str, Any]:
         """Analyze CV using Google Gemini"""
         prompt = self._create_analysis_prompt(cv_text, job_description)
+        model = model or self.model_name
+        
+        config = {
+            "temperature": settings.AI_TEMPERATURE,
+            "max_output_tokens": max_tokens or 8192,  # Room for thinking plus a complete response
+            "response_mime_type": "application/json",  # Force JSON response
+        }
+        if self.supports_thinking(model):
+            # Cap thinking so it cannot eat into the answer's share of the limit
+            config["thinking_config"] = self.types.ThinkingConfig(thinking_budget=self.output_token_overhead)
         
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
+            response = await admission_controller.run_llm(
+                self.client.models.generate_content,
+                model=model,
                 contents=prompt,
-                config=self.types.GenerateContentConfig(
-                    temperature=settings.AI_TEMPERATURE,
-                    max_output_tokens=8192,  # Increased for complete response
-                    response_mime_type="application/json",  # Force JSON response
-                )
+                config=self.types.GenerateContentConfig(**config)
             )
             
+            candidates = getattr(response, 'candidates', None) or []
+            finish_reason = getattr(candidates[0], 'finish_reason', None) if candidates else None
+            if getattr(finish_reason, 'name', finish_reason) == "MAX_TOKENS":
+                raise TruncatedResponseError("Gemini response hit max_output_tokens")
+            
             # Extract full content from response
             if hasattr(response, 'text'):
                 content = response.text.strip()
@@ -261,22 +327,15 @@ class MockAIProvider(BaseAIProvider):
     def __init__(self):
         logger.info("Mock AI provider initialized (for testing)")
     
-    async def analyze_cv(self, cv_text: str, job_description: str) -> Dict[str, Any]:
+    async def analyze_cv(self, cv_text: str, job_description: str,
+                         model: Optional[str] = None, max_tokens: Optional[int] = None) -> Dict[str, Any]:
         """Return mock analysis data"""
         logger.info("Generating mock CV analysis")
         
-        # Simple keyword matching for demo
-        cv_lower = cv_text.lower()
-        jd_lower = job_description.lower()
-        
-        # Extract some keywords for matching
-        common_skills = ["python", "javascript", "react", "fastapi", "docker", "aws", 
-                        "sql", "git", "api", "testing", "agile", "typescript"]
-        
-        matching = [skill for skill in common_skills if skill in cv_lower and skill in jd_lower]
-        missing = [skill for skill in common_skills if skill in jd_lower and skill not in cv_lower]
-        
-        score = min(100, (len(matching) / max(1, len(matching) + len(missing))) * 100 + 20)
+        # Simple keyword matching for demo, on the parsed (cached) CV skills
+        matching, missing, score = skill_service.match(
+            set(cv_parser.parse(cv_text).skills), skill_service.extract(job_description)
+        )
         
         return {
             "score": round(score, 1),
@@ -295,7 +354,7 @@ class MockAIProvider(BaseAIProvider):
             "recommendation": f"The candidate shows a {score:.0f}% match with the job requirements. "
                             f"They demonstrate strong skills in {', '.join(matching[:3]) if matching else 'core competencies'}. "
                             f"To improve their profile, they should focus on developing {', '.join(missing[:2]) if missing else 'additional skills'}. "
-                            f"Overall, this is a {'strong' if score > 70 else 'moderate' if score > 50 else 'developing'} candidate for the role."
+                            f"Overall, this is a {skill_service.verdict(score)} candidate for the role."
         }
 
 
@@ -303,64 +362,245 @@ class AIService:
     """Main AI service that routes to appropriate provider"""
     
     def __init__(self):
-        self.provider = self._initialize_provider()
+        # Provider SDKs are heavy to import, so only the provider class is
+        # selected here; the instance is built on first use or by warm_up().
+        self.provider_class = self._select_provider_class()
+        self._provider: Optional[BaseAIProvider] = None
+        self._provider_lock = threading.Lock()
+        self._warmup_task: Optional[asyncio.Task] = None
+        self.warmup_status = "pending"
+        self._in_flight = 0
+        self._idle: Optional[asyncio.Event] = None
+        self._draining = False
     
-    def _initialize_provider(self) -> BaseAIProvider:
-        """Initialize the appropriate AI provider based on configuration"""
+    def _select_provider_class(self) -> Type[BaseAIProvider]:
+        """Select the appropriate AI provider class based on configuration"""
         provider_name = settings.AI_PROVIDER.lower()
         
         if provider_name == "openai":
             if not settings.AI_API_KEY:
                 logger.warning("No API key provided, falling back to mock provider")
-                return MockAIProvider()
-            return OpenAIProvider()
+                return MockAIProvider
+            return OpenAIProvider
         
         elif provider_name == "anthropic":
             if not settings.AI_API_KEY:
                 logger.warning("No API key provided, falling back to mock provider")
-                return MockAIProvider()
-            return AnthropicProvider()
+                return MockAIProvider
+            return AnthropicProvider
         
         elif provider_name == "gemini":
             if not settings.AI_API_KEY:
                 logger.warning("No API key provided, falling back to mock provider")
-                return MockAIProvider()
-            return GeminiProvider()
+                return MockAIProvider
+            return GeminiProvider
         
         elif provider_name == "mock":
-            return MockAIProvider()
+            return MockAIProvider
         
         else:
             logger.warning(f"Unknown provider '{provider_name}', using mock")
-            return MockAIProvider()
+            return MockAIProvider
+    
+    @property
+    def provider(self) -> BaseAIProvider:
+        """Provider instance, constructed (and its SDK imported) on first access"""
+        if self._provider is None:
+            with self._provider_lock:
+                if self._provider is None:
+                    self._provider = self.provider_class()
+                    self.warmup_status = "ready"
+        return self._provider
+    
+    @provider.setter
+    def provider(self, provider: BaseAIProvider) -> None:
+        self._provider = provider
+        self.provider_class = provider.__class__
+        self.warmup_status = "ready"
+    
+    def import_sdk(self) -> None:
+        """
+        Import the provider SDK module without creating a client
+        
+        Safe to call in a pre-fork master process: it loads code only and
+        opens no connections.
+        """
+        if self.provider_class.sdk_module:
+            try:
+                importlib.import_module(self.provider_class.sdk_module)
+            except ImportError as e:
+                logger.warning(f"Could not preload {self.provider_class.sdk_module}: {str(e)}")
+    
+    async def warm_up(self) -> None:
+        """Construct the provider in a worker thread without blocking the event loop"""
+        if self._provider is not None:
+            return
+        self.warmup_status = "warming"
+        try:
+            await asyncio.to_thread(lambda: self.provider)
+            logger.info(f"AI provider warmed up: {self.provider_class.__name__}")
+        except Exception as e:
+            self.warmup_status = "failed"
+            logger.error(f"AI provider warm-up failed: {str(e)}")
+    
+    def start_warm_up(self) -> None:
+        """Schedule warm_up() as a background task on the running loop"""
+        if self._warmup_task is None and self._provider is None:
+            self._warmup_task = asyncio.create_task(self.warm_up())
     
-    async def analyze_resume(self, cv_text: str, job_description: str) -> Dict[str, Any]:
+    async def get_provider(self) -> BaseAIProvider:
+        """Return the provider, waiting for (or running) warm-up if needed"""
+        if self._provider is None:
+            if self._warmup_task is not None and not self._warmup_task.done():
+                await asyncio.shield(self._warmup_task)
+            if self._provider is None:
+                await asyncio.to_thread(lambda: self.provider)
+        return self._provider
+    
+    async def analyze_resume(self, cv_text: str, job_description: str,
+                             background: bool = False) -> Dict[str, Any]:
         """
         Analyze resume against job description
         
         Args:
             cv_text: Extracted text from CV
             job_description: Job description text
+            background: Wait for an LLM slot without a deadline instead of
+                being rejected after ADMISSION_MAX_WAIT (non-HTTP callers)
             
         Returns:
             Analysis results dictionary
         """
-        logger.info(f"Starting CV analysis using {self.provider.__class__.__name__}")
+        # Parse once (cached by content hash): the pre-score uses the parsed
+        # skills and the provider only sees the sections relevant to a match
+        parsed = cv_parser.parse(cv_text)
+        if settings.AI_SECTION_PROMPTS:
+            cv_text = parsed.prompt_text(settings.AI_MAX_CV_CHARS) or cv_text
+        
+        # Keyed on the text actually sent, so prompt settings changes miss the cache
+        cache_key = cache_service.make_key(
+            self.provider_class.__name__,
+            settings.AI_MODEL,
+            settings.AI_FAST_MODEL,
+            str(settings.AI_TEMPERATURE),
+            cv_text,
+            job_description,
+        )
+        cached = cache_service.get(cache_key)
+        if cached is not None:
+            logger.info("Returning cached CV analysis")
+            return cached
+        
+        if self._draining:
+            raise RuntimeError("Service is shutting down, not accepting new analyses")
+        
+        decision = model_policy.plan(cv_text, job_description, parsed.skills)
+        logger.info(
+            f"Starting CV analysis using {self.provider_class.__name__} "
+            f"({decision.tier} tier: {decision.reason}, max_tokens={decision.max_tokens})"
+        )
         
+        self._call_started()
         try:
-            result = await self.provider.analyze_cv(cv_text, job_description)
-            
-            # Ensure all required fields are present
-            required_fields = ["score", "matching_skills", "missing_skills", "recommendation"]
-            for field in required_fields:
-                if field not in result:
-                    raise ValueError(f"Missing required field: {field}")
+            provider = await self.get_provider()
+            # Every caller (API, ranking, corpus re-analysis, CLI) shares the LLM limit
+            async with admission_controller.llm_slot(background):
+                result = await self._analyze_with(provider, decision, cv_text, job_description)
+                
+                if model_policy.needs_escalation(decision, float(result["score"])):
+                    decision = model_policy.escalate(decision)
+                    logger.info(f"Borderline score {result['score']}, escalating to {decision.model}")
+                    result = await self._analyze_with(provider, decision, cv_text, job_description)
             
+            cache_service.set(cache_key, result)
             return result
             
         except Exception as e:
             logger.error(f"CV analysis failed: {str(e)}")
             raise
+        finally:
+            self._call_finished()
+    
+    async def _analyze_with(self, provider: BaseAIProvider, decision: RoutingDecision,
+                            cv_text: str, job_description: str) -> Dict[str, Any]:
+        """
+        Run one provider call for a routing decision and record its tier stats
+        
+        A response cut off at the output budget is retried once with the
+        full AI_MAX_TOKENS budget.
+        """
+        started = time.monotonic()
+        try:
+            result = await provider.analyze_cv(
+                cv_text, job_description,
+                model=decision.model,
+                max_tokens=decision.max_tokens + provider.output_overhead(decision.model),
+            )
+        except TruncatedResponseError:
+            if decision.max_tokens >= settings.AI_MAX_TOKENS:
+                raise
+            logger.warning(
+                f"Response truncated at {decision.max_tokens} tokens, retrying with {settings.AI_MAX_TOKENS}"
+            )
+            result = await provider.analyze_cv(
+                cv_text, job_description,
+                model=decision.model,
+                max_tokens=settings.AI_MAX_TOKENS + provider.output_overhead(decision.model),
+            )
+        
+        # Ensure all required fields are present
+        required_fields = ["score", "matching_skills", "missing_skills", "recommendation"]
+        for field in required_fields:
+            if field not in result:
+                raise ValueError(f"Missing required field: {field}")
+        
+        model_policy.stats.record(
+            decision.tier,
+            time.monotonic() - started,
+            decision.input_tokens,
+            estimate_tokens(json.dumps(result)),
+        )
+        return result
+    
+    def _call_started(self) -> None:
+        """Record the start of an in-flight LLM call"""
+        if self._idle is None:
+            self._idle = asyncio.Event()
+        self._in_flight += 1
+        self._idle.clear()
+    
+    def _call_finished(self) -> None:
+        """Record the end of an in-flight LLM call"""
+        self._in_flight -= 1
+        if self._in_flight == 0 and self._idle is not None:
+            self._idle.set()
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of LLM calls currently running in this worker"""
+        return self._in_flight
+    
+    async def drain(self, timeout: float) -> bool:
+        """
+        Stop accepting new analyses and wait for in-flight calls to finish
+        
+        Args:
+            timeout: Maximum number of seconds to wait
+            
+        Returns:
+            True if all calls finished, False if the timeout expired first
+        """
+        self._draining = True
+        if self._in_flight == 0:
+            return True
+        
+        logger.info(f"Draining {self._in_flight} in-flight LLM call(s)")
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"Drain timed out with {self._in_flight} LLM call(s) still running")
+            return False
 
 
 # Create global instance
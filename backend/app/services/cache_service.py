@@ -0,0 +1,187 @@
+"""
+Cache Service
+Stores analysis results so repeated CV/job pairs skip the LLM call
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from app.core.config import settings
+from app.utils.logger import logger
+
+
+class BaseCacheBackend(ABC):
+    """Abstract base class for cache backends"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None when missing or expired"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: int) -> None:
+        """Store value under key for ttl seconds"""
+        pass
+
+
+class NullCacheBackend(BaseCacheBackend):
+    """Backend that never stores anything (caching disabled)"""
+
+    def get(self, key: str) -> Optional[str]:
+        return None
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        return None
+
+
+class MemoryCacheBackend(BaseCacheBackend):
+    """In-process LRU cache, private to a single worker"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteCacheBackend(BaseCacheBackend):
+    """
+    SQLite-backed cache shared by every worker on the host
+
+    The database runs in WAL mode so concurrent readers in other workers are
+    not blocked by a writer. Connections are opened lazily per process, which
+    keeps the backend safe to create before gunicorn forks its workers.
+    Expired rows are ignored by reads and deleted every prune_every writes
+    (through an index on expires_at), so writes stay cheap.
+    """
+
+    def __init__(self, path: str, prune_every: int = 100):
+        self.path = path
+        self.prune_every = max(1, prune_every)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this process's connection, opening it after a fork"""
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache(expires_at)")
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at >= ?",
+                (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + ttl)
+            )
+            self._writes += 1
+            if self._writes % self.prune_every == 0:
+                conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+            conn.commit()
+
+
+class CacheService:
+    """JSON cache for analysis results on top of a configurable backend"""
+
+    def __init__(self):
+        self.backend = self._initialize_backend()
+
+    def _initialize_backend(self) -> BaseCacheBackend:
+        """Initialize the cache backend based on configuration"""
+        backend_name = settings.CACHE_BACKEND.lower()
+
+        if backend_name == "sqlite":
+            logger.info(f"Using shared SQLite cache at {settings.CACHE_PATH}")
+            return SQLiteCacheBackend(settings.CACHE_PATH)
+
+        elif backend_name == "memory":
+            return MemoryCacheBackend()
+
+        elif backend_name == "none":
+            return NullCacheBackend()
+
+        else:
+            logger.warning(f"Unknown cache backend '{backend_name}', using memory")
+            return MemoryCacheBackend()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """
+        Build a cache key from its parts
+
+        Args:
+            parts: Strings identifying the cached computation
+
+        Returns:
+            SHA-256 hex digest of the parts
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for key, or None"""
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Cache read failed: {str(e)}")
+            return None
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a result under key, ignoring backend failures"""
+        try:
+            self.backend.set(key, json.dumps(value), settings.CACHE_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"Cache write failed: {str(e)}")
+
+
+# Create global instance
+cache_service = CacheService()
@@ -0,0 +1,463 @@
+"""
+Corpus Store
+Persistent local store of parsed CVs, job descriptions and per-pair analyses
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.services.cv_parser import cv_parser
+from app.services.skill_service import skill_service
+from app.utils.logger import logger
+
+
+# Analysis row states
+STATUS_FRESH = "fresh"      # LLM result for the current job version
+STATUS_LOCAL = "local"      # LLM result adjusted locally for a job edit
+STATUS_QUEUED = "queued"    # waiting for (re-)analysis by the LLM
+STATUS_RUNNING = "running"  # claimed by a worker until claimed_at + CORPUS_LEASE_SECONDS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cvs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    filename TEXT NOT NULL,
+    content_hash TEXT NOT NULL UNIQUE,
+    text TEXT NOT NULL,
+    skills TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    requirements TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS analyses (
+    cv_id INTEGER NOT NULL REFERENCES cvs(id),
+    job_id INTEGER NOT NULL REFERENCES jobs(id),
+    job_version INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    score REAL NOT NULL,
+    result TEXT,
+    updated_at REAL NOT NULL,
+    claimed_at REAL,
+    PRIMARY KEY (cv_id, job_id)
+);
+CREATE INDEX IF NOT EXISTS analyses_status ON analyses(status);
+"""
+
+
+class CorpusStore:
+    """
+    SQLite store for CVs, jobs and their pairwise analyses
+
+    Like the shared cache, the database runs in WAL mode and connections are
+    opened lazily per process so every worker can use the same file. Methods
+    are blocking and thread-safe; async callers run them with asyncio.to_thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.RLock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this process's connection, opening it after a fork"""
+        with self._lock:
+            if self._conn is None or self._pid != os.getpid():
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False,
+                                       isolation_level=None)
+                conn.row_factory = sqlite3.Row
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(SCHEMA)
+                columns = {row["name"] for row in conn.execute("PRAGMA table_info(analyses)")}
+                if "claimed_at" not in columns:
+                    conn.execute("ALTER TABLE analyses ADD COLUMN claimed_at REAL")
+                self._conn = conn
+                self._pid = os.getpid()
+            return self._conn
+
+    def _transaction(self):
+        """Open a write transaction (BEGIN IMMEDIATE) on this process's connection"""
+        return _Transaction(self._connection(), self._lock)
+
+    # CVs
+
+    def add_cv(self, text: str, filename: str = "") -> Tuple[Dict[str, Any], bool]:
+        """
+        Store a parsed CV and queue its analysis against every job
+
+        Args:
+            text: Extracted CV text
+            filename: Original file name
+
+        Returns:
+            Tuple of (CV record, whether it was newly added)
+        """
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT * FROM cvs WHERE content_hash = ?", (content_hash,)).fetchone()
+            if row is not None:
+                return self._cv_record(row), False
+
+            skills = sorted(cv_parser.parse(text).skills)
+            cursor = conn.execute(
+                "INSERT INTO cvs (filename, content_hash, text, skills, created_at) VALUES (?, ?, ?, ?, ?)",
+                (filename, content_hash, text, json.dumps(skills), time.time())
+            )
+            cv_id = cursor.lastrowid
+            for job in conn.execute("SELECT id, requirements, version FROM jobs").fetchall():
+                self._queue_pair(conn, cv_id, job["id"], job["version"], skills,
+                                 json.loads(job["requirements"]))
+            row = conn.execute("SELECT * FROM cvs WHERE id = ?", (cv_id,)).fetchone()
+
+        logger.info(f"Stored CV {cv_id} ({filename or 'unnamed'}) with {len(skills)} skills")
+        return self._cv_record(row), True
+
+    def get_cv(self, cv_id: int) -> Optional[Dict[str, Any]]:
+        """Return a CV record with its text, or None"""
+        with self._lock:
+            row = self._connection().execute("SELECT * FROM cvs WHERE id = ?", (cv_id,)).fetchone()
+        return self._cv_record(row, with_text=True) if row else None
+
+    @staticmethod
+    def _cv_record(row: sqlite3.Row, with_text: bool = False) -> Dict[str, Any]:
+        record = {
+            "id": row["id"],
+            "filename": row["filename"],
+            "content_hash": row["content_hash"],
+            "skills": json.loads(row["skills"]),
+        }
+        if with_text:
+            record["text"] = row["text"]
+        return record
+
+    def cv_skill_sets(self) -> List[Tuple[int, List[str]]]:
+        """Return (CV id, extracted skills) for every stored CV"""
+        with self._lock:
+            rows = self._connection().execute("SELECT id, skills FROM cvs ORDER BY id").fetchall()
+        return [(row["id"], json.loads(row["skills"])) for row in rows]
+
+    # Jobs
+
+    def add_job(self, title: str, description: str) -> Dict[str, Any]:
+        """
+        Store a job description and queue its analysis against every CV
+
+        Args:
+            title: Job title
+            description: Job description text
+
+        Returns:
+            Job record
+        """
+        requirements = sorted(skill_service.extract(description))
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (title, description, requirements, version, updated_at) VALUES (?, ?, ?, 1, ?)",
+                (title, description, json.dumps(requirements), time.time())
+            )
+            job_id = cursor.lastrowid
+            for cv in conn.execute("SELECT id, skills FROM cvs").fetchall():
+                self._queue_pair(conn, cv["id"], job_id, 1, json.loads(cv["skills"]), requirements)
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job_record(row)
+
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Return a job record, or None"""
+        with self._lock:
+            row = self._connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job_record(row) if row else None
+
+    def job_requirement_sets(self) -> List[Tuple[int, List[str]]]:
+        """Return (job id, required skills) for every stored job"""
+        with self._lock:
+            rows = self._connection().execute("SELECT id, requirements FROM jobs ORDER BY id").fetchall()
+        return [(row["id"], json.loads(row["requirements"])) for row in rows]
+
+    def update_job(self, job_id: int, title: str, description: str) -> Dict[str, Any]:
+        """
+        Edit a job description and re-score only the affected pairs
+
+        The requirement sets of the old and new descriptions are diffed. If
+        they are equal, existing results stay valid. Otherwise every stored
+        result gets the local skill delta applied immediately (matching and
+        missing lists plus the keyword score change), and the pair is queued
+        for LLM re-analysis only when that change is large enough to alter
+        the outcome (RESCORE_LLM_THRESHOLD) or crosses a verdict boundary.
+
+        Args:
+            job_id: Job to edit
+            title: New job title
+            description: New job description text
+
+        Returns:
+            Summary with the job record, requirement diff and per-status counts
+
+        Raises:
+            KeyError: If the job does not exist
+        """
+        new_requirements = sorted(skill_service.extract(description))
+        summary = {"unchanged": 0, "local": 0, "queued": 0}
+
+        with self._transaction() as conn:
+            job = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None:
+                raise KeyError(job_id)
+
+            old_requirements = json.loads(job["requirements"])
+            added = sorted(set(new_requirements) - set(old_requirements))
+            removed = sorted(set(old_requirements) - set(new_requirements))
+            version = job["version"] + 1
+            conn.execute(
+                "UPDATE jobs SET title = ?, description = ?, requirements = ?, version = ?, updated_at = ? WHERE id = ?",
+                (title, description, json.dumps(new_requirements), version, time.time(), job_id)
+            )
+
+            rows = conn.execute(
+                "SELECT a.*, c.skills FROM analyses a JOIN cvs c ON c.id = a.cv_id WHERE a.job_id = ?",
+                (job_id,)
+            ).fetchall()
+            for row in rows:
+                cv_skills = json.loads(row["skills"])
+                if not added and not removed:
+                    conn.execute(
+                        "UPDATE analyses SET job_version = ? WHERE cv_id = ? AND job_id = ?",
+                        (version, row["cv_id"], job_id)
+                    )
+                    summary["unchanged"] += 1
+                    continue
+
+                status = self._apply_local_delta(
+                    conn, row, version, cv_skills, old_requirements, new_requirements, added, removed
+                )
+                summary[status] += 1
+
+            updated = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+        logger.info(
+            f"Job {job_id} edited (+{len(added)}/-{len(removed)} requirements): "
+            f"{summary['local']} pairs re-scored locally, {summary['queued']} queued for LLM"
+        )
+        return {
+            "job": self._job_record(updated),
+            "added_requirements": added,
+            "removed_requirements": removed,
+            **summary,
+        }
+
+    def _apply_local_delta(self, conn: sqlite3.Connection, row: sqlite3.Row, version: int,
+                           cv_skills: List[str], old_requirements: List[str],
+                           new_requirements: List[str], added: List[str], removed: List[str]) -> str:
+        """Patch a stored result for a requirement change and decide whether to queue it"""
+        _, _, old_local = skill_service.match(cv_skills, old_requirements)
+        _, _, new_local = skill_service.match(cv_skills, new_requirements)
+        delta = new_local - old_local
+        score = max(0.0, min(100.0, row["score"] + delta))
+
+        result = json.loads(row["result"]) if row["result"] else None
+        if result is not None:
+            dropped = {skill.lower() for skill in removed}
+            gained = [skill for skill in added if skill in cv_skills]
+            lacking = [skill for skill in added if skill not in cv_skills]
+            result["matching_skills"] = [
+                s for s in result.get("matching_skills", []) if s.lower() not in dropped
+            ] + gained
+            result["missing_skills"] = [
+                s for s in result.get("missing_skills", []) if s.lower() not in dropped
+            ] + lacking
+            result["score"] = round(score, 1)
+
+        needs_llm = (
+            result is None
+            or row["status"] in (STATUS_QUEUED, STATUS_RUNNING)
+            or abs(delta) >= settings.RESCORE_LLM_THRESHOLD
+            or skill_service.verdict(score) != skill_service.verdict(row["score"])
+        )
+        status = STATUS_QUEUED if needs_llm else STATUS_LOCAL
+        conn.execute(
+            "UPDATE analyses SET job_version = ?, status = ?, score = ?, result = ?, updated_at = ? "
+            "WHERE cv_id = ? AND job_id = ?",
+            (version, status, score, json.dumps(result) if result is not None else None,
+             time.time(), row["cv_id"], row["job_id"])
+        )
+        return status
+
+    @staticmethod
+    def _job_record(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "description": row["description"],
+            "requirements": json.loads(row["requirements"]),
+            "version": row["version"],
+        }
+
+    # Analyses
+
+    @staticmethod
+    def _queue_pair(conn: sqlite3.Connection, cv_id: int, job_id: int, version: int,
+                    cv_skills: List[str], requirements: List[str]) -> None:
+        """Insert a queued pair with its local keyword score as a provisional score"""
+        _, _, score = skill_service.match(cv_skills, requirements)
+        conn.execute(
+            "INSERT OR IGNORE INTO analyses (cv_id, job_id, job_version, status, score, result, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, NULL, ?)",
+            (cv_id, job_id, version, STATUS_QUEUED, score, time.time())
+        )
+
+    def claim_queued(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Atomically claim queued pairs for LLM analysis
+
+        A claim is a lease: pairs left 'running' longer than
+        CORPUS_LEASE_SECONDS (their worker died or was restarted) are
+        claimable again.
+
+        Args:
+            limit: Maximum number of pairs to claim
+
+        Returns:
+            List of pairs with CV text, job description and job version
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT a.cv_id, a.job_id, a.job_version, c.text, j.description "
+                "FROM analyses a JOIN cvs c ON c.id = a.cv_id JOIN jobs j ON j.id = a.job_id "
+                "WHERE a.status = ? OR (a.status = ? AND (a.claimed_at IS NULL OR a.claimed_at < ?)) "
+                "ORDER BY a.updated_at LIMIT ?",
+                (STATUS_QUEUED, STATUS_RUNNING, now - settings.CORPUS_LEASE_SECONDS, limit)
+            ).fetchall()
+            for row in rows:
+                conn.execute(
+                    "UPDATE analyses SET status = ?, claimed_at = ? WHERE cv_id = ? AND job_id = ?",
+                    (STATUS_RUNNING, now, row["cv_id"], row["job_id"])
+                )
+        return [dict(row) for row in rows]
+
+    def record_analysis(self, cv_id: int, job_id: int, job_version: int,
+                        result: Optional[Dict[str, Any]]) -> bool:
+        """
+        Store an LLM result, or requeue the pair if the analysis failed
+
+        Results computed for an outdated job version are discarded and the
+        pair stays queued for the current version.
+
+        Returns:
+            True if the result was stored
+        """
+        with self._transaction() as conn:
+            current = conn.execute(
+                "SELECT job_version FROM analyses WHERE cv_id = ? AND job_id = ?", (cv_id, job_id)
+            ).fetchone()
+            if current is None:
+                return False
+            if result is None or current["job_version"] != job_version:
+                conn.execute(
+                    "UPDATE analyses SET status = ? WHERE cv_id = ? AND job_id = ?",
+                    (STATUS_QUEUED, cv_id, job_id)
+                )
+                return False
+            conn.execute(
+                "UPDATE analyses SET status = ?, score = ?, result = ?, updated_at = ? "
+                "WHERE cv_id = ? AND job_id = ?",
+                (STATUS_FRESH, float(result["score"]), json.dumps(result), time.time(), cv_id, job_id)
+            )
+        return True
+
+    def job_results(self, job_id: int) -> List[Dict[str, Any]]:
+        """Return every analysis for a job, best score first"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT a.cv_id, c.filename, a.job_version, a.status, a.score, a.result "
+                "FROM analyses a JOIN cvs c ON c.id = a.cv_id WHERE a.job_id = ? ORDER BY a.score DESC",
+                (job_id,)
+            ).fetchall()
+        return [
+            {
+                "cv_id": row["cv_id"],
+                "filename": row["filename"],
+                "job_version": row["job_version"],
+                "status": row["status"],
+                "score": round(row["score"], 1),
+                "analysis": json.loads(row["result"]) if row["result"] else None,
+            }
+            for row in rows
+        ]
+
+
+class _Transaction:
+    """Context manager for a BEGIN IMMEDIATE ... COMMIT/ROLLBACK block"""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.RLock):
+        self.conn = conn
+        self.lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.lock.acquire()
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        finally:
+            self.lock.release()
+
+
+async def process_reanalysis_queue(store: CorpusStore, ai_service, batch_size: int) -> int:
+    """
+    Run LLM analysis for queued pairs until the queue is empty
+
+    Args:
+        store: Corpus store holding the queue
+        ai_service: Service used for the analysis
+        batch_size: Number of pairs claimed (and analyzed concurrently) at a time
+
+    Returns:
+        Number of results stored
+    """
+    stored = 0
+    while True:
+        pairs = await asyncio.to_thread(store.claim_queued, batch_size)
+        if not pairs:
+            return stored
+
+        async def analyze(pair: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            try:
+                return await ai_service.analyze_resume(pair["text"], pair["description"], background=True)
+            except Exception as e:
+                logger.error(f"Re-analysis failed for CV {pair['cv_id']} / job {pair['job_id']}: {str(e)}")
+                return None
+
+        results = await asyncio.gather(*(analyze(pair) for pair in pairs))
+        failures = 0
+        for pair, result in zip(pairs, results):
+            if await asyncio.to_thread(
+                store.record_analysis, pair["cv_id"], pair["job_id"], pair["job_version"], result
+            ):
+                stored += 1
+            elif result is None:
+                failures += 1
+        if failures == len(pairs):
+            # Provider unavailable: leave the rest queued for a later run
+            logger.warning("Every analysis in the batch failed, pausing re-analysis")
+            return stored
+
+
+# Create global instance (the database is created on first use)
+corpus_store = CorpusStore(settings.CORPUS_PATH)
@@ -0,0 +1,207 @@
+"""
+CV Parser
+Segments extracted CV text into sections with dates and skill mentions
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from app.core.config import settings
+from app.services.skill_service import skill_service
+
+
+# Section kind -> headings that introduce it (normalized: lowercase, no trailing colon)
+SECTION_HEADINGS: Dict[str, List[str]] = {
+    "summary": ["summary", "profile", "professional summary", "about me", "objective",
+                "career objective", "profil", "à propos"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history",
+                   "expérience", "expériences", "expérience professionnelle",
+                   "expériences professionnelles"],
+    "education": ["education", "academic background", "qualifications", "education and training",
+                  "formation", "formations", "études", "diplômes"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "competencies",
+               "technologies", "tech stack", "compétences", "compétences techniques"],
+    "certifications": ["certifications", "certification", "certificates", "licenses",
+                       "licenses and certifications", "certificats"],
+    "projects": ["projects", "personal projects", "key projects", "projets"],
+    "languages": ["languages", "langues"],
+    "interests": ["interests", "hobbies", "centres d'intérêt", "loisirs"],
+    "references": ["references", "références"],
+}
+
+# Order in which sections are sent to the LLM; kinds not listed are left out
+PROMPT_SECTION_ORDER = (
+    "header", "summary", "skills", "experience", "projects",
+    "certifications", "education", "languages", "other",
+)
+
+# Sections made of entries whose titles (employers, schools) look like headings
+ENTRY_SECTIONS = frozenset({"experience", "education", "projects"})
+
+_HEADING_KIND = {heading: kind for kind, headings in SECTION_HEADINGS.items() for heading in headings}
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|janv|févr|mars|avr|mai|juin|juil|août|sept|déc)[a-zéû]*\.?"
+_DATE = rf"(?:{_MONTH}\s+)?(?:19|20)\d{{2}}|\d{{1,2}}/(?:19|20)\d{{2}}"
+_OPEN_END = r"present|current|now|today|aujourd'hui|présent|en cours"
+DATE_RANGE_PATTERN = re.compile(
+    rf"\b({_DATE})\s*(?:-|–|—|to|à|au)\s*({_DATE}|{_OPEN_END})\b", re.IGNORECASE
+)
+YEAR_PATTERN = re.compile(r"(?:19|20)\d{2}")
+
+
+def _normalize_heading(line: str) -> str:
+    return re.sub(r"\s+", " ", line.strip(" \t•*-–—#|:").lower())
+
+
+@dataclass(frozen=True, slots=True)
+class Section:
+    """One section of a CV"""
+    kind: str
+    heading: str
+    text: str
+    skills: FrozenSet[str]
+
+    @property
+    def date_ranges(self) -> Tuple[Tuple[str, str], ...]:
+        """(start, end) date ranges in the section, computed on demand"""
+        if not YEAR_PATTERN.search(self.text):
+            return ()
+        return tuple(DATE_RANGE_PATTERN.findall(self.text))
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedCV:
+    """Structured view of a CV, computed once per distinct text"""
+    content_hash: str
+    sections: Tuple[Section, ...]
+    skills: FrozenSet[str]
+
+    @property
+    def years_of_experience(self) -> float:
+        """Years covered by experience date ranges (overlaps counted once)"""
+        current_year = time.localtime().tm_year
+        spans = []
+        for section in self.sections:
+            if section.kind != "experience":
+                continue
+            for start, end in section.date_ranges:
+                start_year = YEAR_PATTERN.search(start)
+                end_year = YEAR_PATTERN.search(end)
+                first = int(start_year.group())
+                last = int(end_year.group()) if end_year else current_year
+                if last >= first:
+                    spans.append((first, last))
+        total, covered_to = 0, 0
+        for first, last in sorted(spans):
+            first = max(first, covered_to)
+            if last > first:
+                total += last - first
+                covered_to = last
+        return float(total)
+
+    def section(self, kind: str) -> Optional[Section]:
+        """First section of a kind, or None"""
+        return next((s for s in self.sections if s.kind == kind), None)
+
+    def prompt_text(self, max_chars: int) -> str:
+        """
+        Compact CV text for LLM prompts
+
+        Keeps the sections relevant to a job match, most informative first,
+        and truncates to max_chars. Sections such as interests and references
+        are dropped. When some headings were not recognised the sections keep
+        their original order.
+        """
+        kept = [s for s in self.sections if s.kind in PROMPT_SECTION_ORDER and s.text]
+        if not any(s.kind == "other" for s in kept):
+            kept.sort(key=lambda s: PROMPT_SECTION_ORDER.index(s.kind))
+        parts = [f"{s.heading.upper()}\n{s.text}" if s.heading else s.text for s in kept]
+        return "\n\n".join(parts)[:max_chars]
+
+
+class CVParser:
+    """Parses CV text into a ParsedCV, with an LRU cache keyed by content hash"""
+
+    def __init__(self, cache_size: int = 512):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, ParsedCV]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def parse(self, text: str) -> ParsedCV:
+        """
+        Parse CV text, reusing the cached result for identical text
+
+        Args:
+            text: Text extracted from the CV
+
+        Returns:
+            ParsedCV for the text
+        """
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            parsed = self._cache.get(content_hash)
+            if parsed is not None:
+                self._cache.move_to_end(content_hash)
+                return parsed
+
+        parsed = self._parse(text, content_hash)
+        with self._lock:
+            self._cache[content_hash] = parsed
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return parsed
+
+    def _parse(self, text: str, content_hash: str) -> ParsedCV:
+        sections = tuple(
+            Section(
+                kind=kind,
+                heading=heading,
+                text=body,
+                skills=frozenset(skill_service.extract(f"{heading}\n{body}")),
+            )
+            for kind, heading, body in self._split(text)
+        )
+        return ParsedCV(
+            content_hash=content_hash,
+            sections=sections,
+            skills=frozenset().union(*(section.skills for section in sections)),
+        )
+
+    @staticmethod
+    def _split(text: str) -> List[Tuple[str, str, str]]:
+        """Split text at heading lines into (kind, heading, body) triples"""
+        parts: List[Tuple[str, str, List[str]]] = [("header", "", [])]
+        after_blank = False
+        for line in text.splitlines():
+            stripped = line.strip()
+            kind = None
+            if 0 < len(stripped) <= 40:
+                normalized = _normalize_heading(stripped)
+                kind = _HEADING_KIND.get(normalized)
+                # An unknown heading (short, all-caps or colon-terminated) needs a
+                # blank line before it, and never opens inside experience, education
+                # or projects, where such lines are usually employer or school names
+                if (kind is None and len(parts) > 1 and after_blank
+                        and parts[-1][0] not in ENTRY_SECTIONS
+                        and (stripped.isupper() or stripped.endswith(":"))
+                        and len(normalized.split()) <= 4 and normalized.replace(" ", "").isalpha()):
+                    kind = "other"
+            if kind is not None:
+                parts.append((kind, stripped.rstrip(":").strip(), []))
+            else:
+                parts[-1][2].append(line)
+            after_blank = not stripped
+        return [
+            (kind, heading, "\n".join(lines).strip())
+            for kind, heading, lines in parts
+            if heading or any(l.strip() for l in lines)
+        ]
+
+
+# Create global instance
+cv_parser = CVParser(settings.CV_PARSE_CACHE_SIZE)
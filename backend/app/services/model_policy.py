@@ -0,0 +1,145 @@
+"""
+Model Policy
+Chooses the model tier and output token budget for each analysis
+"""
+
+import threading
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, Optional
+from app.core.config import settings
+from app.services.skill_service import skill_service
+
+
+TIER_FAST = "fast"
+TIER_LARGE = "large"
+
+# Rough characters-per-token ratio for English text, used for budgeting only
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a text"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+@dataclass(frozen=True)
+class RoutingDecision:
+    """Which model to call for one analysis, and with what output budget"""
+    tier: str
+    model: Optional[str]
+    max_tokens: int
+    input_tokens: int
+    pre_score: float
+    reason: str
+    escalated: bool = False
+
+
+class TierStats:
+    """Latency and estimated cost per tier"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tiers: Dict[str, Dict[str, float]] = {}
+
+    def record(self, tier: str, latency: float, input_tokens: int, output_tokens: int) -> None:
+        price = settings.AI_FAST_COST_PER_1K_TOKENS if tier == TIER_FAST else settings.AI_COST_PER_1K_TOKENS
+        with self._lock:
+            stats = self._tiers.setdefault(tier, {
+                "calls": 0, "latency_s": 0.0, "max_latency_s": 0.0,
+                "input_tokens": 0, "output_tokens": 0, "cost": 0.0,
+            })
+            stats["calls"] += 1
+            stats["latency_s"] += latency
+            stats["max_latency_s"] = max(stats["max_latency_s"], latency)
+            stats["input_tokens"] += input_tokens
+            stats["output_tokens"] += output_tokens
+            stats["cost"] += (input_tokens + output_tokens) / 1000 * price
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                tier: {
+                    "calls": int(stats["calls"]),
+                    "mean_latency_ms": round(stats["latency_s"] / stats["calls"] * 1000, 1),
+                    "max_latency_ms": round(stats["max_latency_s"] * 1000, 1),
+                    "input_tokens": int(stats["input_tokens"]),
+                    "output_tokens": int(stats["output_tokens"]),
+                    "estimated_cost": round(stats["cost"], 4),
+                    "mean_cost": round(stats["cost"] / stats["calls"], 5),
+                }
+                for tier, stats in self._tiers.items()
+            }
+
+
+class ModelPolicy:
+    """
+    Per-request model tiering and output token budgeting
+
+    Requests are routed to the fast model (AI_FAST_MODEL) when they are
+    small or when the local keyword pre-score is clear-cut, and to the large
+    model (AI_MODEL) otherwise. A fast-tier result whose score lands in the
+    borderline band is escalated to the large model. Without AI_FAST_MODEL
+    every request uses the large model.
+    """
+
+    def __init__(self):
+        self.stats = TierStats()
+
+    def output_budget(self, input_tokens: int) -> int:
+        """Size the output token budget to the input, within configured bounds"""
+        budget = settings.AI_MIN_OUTPUT_TOKENS + int(input_tokens * settings.AI_OUTPUT_TOKENS_PER_INPUT_TOKEN)
+        return max(settings.AI_MIN_OUTPUT_TOKENS, min(settings.AI_MAX_TOKENS, budget))
+
+    def pre_score(self, cv_skills: Iterable[str], job_description: str) -> float:
+        """Local keyword score used to judge how clear-cut a pair is"""
+        _, _, score = skill_service.match(set(cv_skills), skill_service.extract(job_description))
+        return score
+
+    def plan(self, cv_text: str, job_description: str,
+             cv_skills: Optional[Iterable[str]] = None) -> RoutingDecision:
+        """
+        Decide the tier, model and output budget for an analysis
+
+        Args:
+            cv_text: CV text as it will be sent to the provider
+            job_description: Job description text
+            cv_skills: Skills already extracted from the CV (extracted from cv_text if omitted)
+
+        Returns:
+            RoutingDecision for the first call
+        """
+        input_tokens = estimate_tokens(cv_text) + estimate_tokens(job_description)
+        max_tokens = self.output_budget(input_tokens)
+        if cv_skills is None:
+            cv_skills = skill_service.extract(cv_text)
+        pre_score = self.pre_score(cv_skills, job_description)
+
+        if not settings.AI_FAST_MODEL:
+            return RoutingDecision(TIER_LARGE, settings.AI_MODEL or None, max_tokens,
+                                   input_tokens, pre_score, "single tier")
+
+        if input_tokens <= settings.AI_FAST_MAX_INPUT_TOKENS:
+            reason = "small input"
+        elif pre_score <= settings.AI_CLEAR_LOW_SCORE or pre_score >= settings.AI_CLEAR_HIGH_SCORE:
+            reason = "clear-cut pre-score"
+        else:
+            return RoutingDecision(TIER_LARGE, settings.AI_MODEL or None, max_tokens,
+                                   input_tokens, pre_score, "ambiguous pre-score")
+        return RoutingDecision(TIER_FAST, settings.AI_FAST_MODEL, max_tokens,
+                               input_tokens, pre_score, reason)
+
+    def needs_escalation(self, decision: RoutingDecision, score: float) -> bool:
+        """Whether a fast-tier result is borderline and must be confirmed by the large model"""
+        return (
+            decision.tier == TIER_FAST
+            and settings.AI_BORDERLINE_LOW <= score <= settings.AI_BORDERLINE_HIGH
+        )
+
+    def escalate(self, decision: RoutingDecision) -> RoutingDecision:
+        """Routing decision for re-running a borderline case on the large model"""
+        return replace(decision, tier=TIER_LARGE, model=settings.AI_MODEL or None,
+                       reason="borderline fast-tier score", escalated=True)
+
+
+# Create global instance
+model_policy = ModelPolicy()
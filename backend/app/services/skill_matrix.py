@@ -0,0 +1,176 @@
+"""
+Skill Matrix Service
+Vectorized bulk matching of many CVs against many job descriptions
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence, Set
+import numpy as np
+from app.services.cv_parser import cv_parser
+from app.services.skill_service import SkillService, skill_service
+
+if TYPE_CHECKING:
+    # scipy is imported on first use so it does not slow down app startup
+    from scipy import sparse
+
+
+@dataclass
+class SkillMatrix:
+    """Coverage of every job's requirements by every CV"""
+    vocabulary: List[str]
+    cvs: "sparse.csr_matrix"      # (n_cvs, n_skills) skill indicators
+    jobs: "sparse.csr_matrix"     # (n_jobs, n_skills) requirement indicators
+    matched: np.ndarray           # (n_cvs, n_jobs) number of requirements met
+    required: np.ndarray          # (n_jobs,) number of requirements per job
+
+    @property
+    def missing(self) -> np.ndarray:
+        """(n_cvs, n_jobs) number of requirements not met"""
+        return self.required[np.newaxis, :] - self.matched
+
+    @property
+    def coverage(self) -> np.ndarray:
+        """(n_cvs, n_jobs) fraction of requirements met (0 for jobs without requirements)"""
+        return self.matched / np.maximum(self.required, 1)[np.newaxis, :]
+
+    @property
+    def scores(self) -> np.ndarray:
+        """(n_cvs, n_jobs) keyword scores, identical to SkillService.match"""
+        return np.minimum(100.0, self.coverage * 100 + 20)
+
+    def matching_skills(self, cv: int, job: int) -> List[str]:
+        """Requirements of a job that a CV meets"""
+        return self._names(set(self._row(self.jobs, job)) & set(self._row(self.cvs, cv)))
+
+    def missing_skills(self, cv: int, job: int) -> List[str]:
+        """Requirements of a job that a CV does not meet"""
+        return self._names(set(self._row(self.jobs, job)) - set(self._row(self.cvs, cv)))
+
+    def top_cvs(self, job: int, n: int) -> List[int]:
+        """Indices of the n best-covering CVs for a job, best first"""
+        column = self.coverage[:, job]
+        n = min(n, len(column))
+        if n == 0:
+            return []
+        best = np.argpartition(-column, n - 1)[:n]
+        return best[np.argsort(-column[best], kind="stable")].tolist()
+
+    @staticmethod
+    def _row(matrix: "sparse.csr_matrix", i: int) -> np.ndarray:
+        return matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]]
+
+    def _names(self, columns: Set[int]) -> List[str]:
+        return [self.vocabulary[c] for c in sorted(columns)]
+
+
+class SkillMatrixService:
+    """
+    Encodes CVs and jobs as sparse skill-indicator vectors over one vocabulary
+
+    Each text is scanned once, so the cost is O(CVs + jobs) extractions plus a
+    single sparse product, instead of re-scanning both texts for every pair.
+    """
+
+    def __init__(self, skills: SkillService = skill_service):
+        self.skills = skills
+        self.vocabulary = skills.vocabulary
+        self._column = {skill: i for i, skill in enumerate(self.vocabulary)}
+
+    def encode_skill_sets(self, skill_sets: Sequence[Iterable[str]]) -> "sparse.csr_matrix":
+        """
+        Build a binary indicator matrix from already-extracted skill sets
+
+        Args:
+            skill_sets: One iterable of canonical skill names per row
+
+        Returns:
+            (len(skill_sets), len(vocabulary)) CSR matrix
+        """
+        from scipy import sparse
+
+        indptr = [0]
+        indices: List[int] = []
+        for skill_set in skill_sets:
+            indices.extend(sorted({self._column[s] for s in skill_set if s in self._column}))
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.int32)
+        return sparse.csr_matrix(
+            (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(skill_sets), len(self.vocabulary))
+        )
+
+    def encode(self, texts: Sequence[str]) -> "sparse.csr_matrix":
+        """Extract skills from texts and build their indicator matrix"""
+        return self.encode_skill_sets([self.skills.extract(text) for text in texts])
+
+    def encode_cvs(self, cv_texts: Sequence[str]) -> "sparse.csr_matrix":
+        """
+        Build the indicator matrix for CVs from their parsed (cached) skills
+
+        Batches larger than the parser cache would only churn it, so their
+        texts are scanned directly.
+        """
+        if len(cv_texts) > cv_parser.cache_size:
+            return self.encode(cv_texts)
+        return self.encode_skill_sets([cv_parser.parse(text).skills for text in cv_texts])
+
+    def compute(self, cvs: "sparse.csr_matrix", jobs: "sparse.csr_matrix") -> SkillMatrix:
+        """
+        Match every CV against every job with one sparse matrix product
+
+        Args:
+            cvs: CV indicator matrix from encode()
+            jobs: Job requirement indicator matrix from encode()
+
+        Returns:
+            SkillMatrix with matched/required counts for all pairs
+        """
+        matched = (cvs @ jobs.T).toarray()
+        required = np.asarray(jobs.sum(axis=1)).ravel()
+        return SkillMatrix(self.vocabulary, cvs, jobs, matched, required)
+
+    def match_texts(self, cv_texts: Sequence[str], job_texts: Sequence[str]) -> SkillMatrix:
+        """Encode raw CV and job texts and match them"""
+        return self.compute(self.encode_cvs(cv_texts), self.encode(job_texts))
+
+    def summarize(self, matrix: SkillMatrix, cv_ids: Sequence, job_ids: Sequence,
+                  top_n: int) -> Dict:
+        """
+        Serializable overview: score matrix plus each job's best candidates
+
+        Args:
+            matrix: Computed skill matrix
+            cv_ids: Identifiers for the matrix rows
+            job_ids: Identifiers for the matrix columns
+            top_n: Number of best candidates listed per job
+
+        Returns:
+            Dictionary suitable for a JSON response
+        """
+        scores = np.round(matrix.scores, 1)
+        return {
+            "cv_ids": list(cv_ids),
+            "job_ids": list(job_ids),
+            "scores": scores.tolist(),
+            "coverage": np.round(matrix.coverage, 3).tolist(),
+            "missing_counts": matrix.missing.tolist(),
+            "best_matches": [
+                {
+                    "job_id": job_ids[j],
+                    "candidates": [
+                        {
+                            "cv_id": cv_ids[i],
+                            "score": float(scores[i, j]),
+                            "matching_skills": matrix.matching_skills(i, j),
+                            "missing_skills": matrix.missing_skills(i, j),
+                        }
+                        for i in matrix.top_cvs(j, top_n)
+                    ],
+                }
+                for j in range(len(job_ids))
+            ],
+        }
+
+
+# Create global instance
+skill_matrix_service = SkillMatrixService()
@@ -0,0 +1,111 @@
+"""
+Skill Service
+Local, dependency-free skill extraction and keyword match scoring
+"""
+
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+# Canonical skill name -> spellings recognised in text (lowercase)
+SKILL_ALIASES: Dict[str, List[str]] = {
+    "python": ["python"],
+    "javascript": ["javascript", "js"],
+    "typescript": ["typescript"],
+    "react": ["react", "react.js", "reactjs"],
+    "vue": ["vue", "vue.js", "vuejs"],
+    "angular": ["angular"],
+    "node.js": ["node.js", "nodejs"],
+    "fastapi": ["fastapi"],
+    "django": ["django"],
+    "flask": ["flask"],
+    "java": ["java"],
+    "spring": ["spring boot", "spring framework"],
+    "c#": ["c#", ".net", "dotnet"],
+    "c++": ["c++", "cpp"],
+    "go": ["golang"],
+    "rust": ["rust"],
+    "php": ["php"],
+    "ruby": ["ruby", "rails", "ruby on rails"],
+    "sql": ["sql", "mysql", "postgresql", "postgres", "sqlite"],
+    "nosql": ["nosql", "mongodb", "cassandra", "dynamodb"],
+    "redis": ["redis"],
+    "docker": ["docker"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "terraform": ["terraform"],
+    "aws": ["aws", "amazon web services"],
+    "azure": ["azure"],
+    "gcp": ["gcp", "google cloud"],
+    "linux": ["linux"],
+    "git": ["git", "github", "gitlab"],
+    "ci/cd": ["ci/cd", "jenkins", "github actions", "gitlab ci"],
+    "api": ["api", "apis", "rest api", "restful", "graphql"],
+    "microservices": ["microservices", "microservice"],
+    "testing": ["testing", "unit tests", "pytest", "jest", "tdd"],
+    "agile": ["agile", "scrum", "kanban"],
+    "machine learning": ["machine learning", "ml", "deep learning"],
+    "data analysis": ["data analysis", "pandas", "numpy"],
+    "html": ["html", "html5"],
+    "css": ["css", "css3", "sass", "tailwind"],
+    "leadership": ["leadership", "team lead", "mentoring"],
+    "project management": ["project management", "pmp"],
+}
+
+
+class SkillService:
+    """Extracts canonical skills from free text with a single regex pass"""
+
+    def __init__(self, aliases: Dict[str, List[str]] = SKILL_ALIASES):
+        self.aliases = aliases
+        self._canonical = {
+            alias: skill for skill, spellings in aliases.items() for alias in spellings
+        }
+        # Longest spellings first so "ruby on rails" wins over "ruby"
+        alternation = "|".join(
+            re.escape(alias) for alias in sorted(self._canonical, key=len, reverse=True)
+        )
+        self._pattern = re.compile(rf"(?<![a-z0-9+#])(?:{alternation})(?![a-z0-9+#])")
+
+    @property
+    def vocabulary(self) -> List[str]:
+        """Canonical skill names, in a stable order"""
+        return list(self.aliases)
+
+    def extract(self, text: str) -> Set[str]:
+        """
+        Find the skills mentioned in a text
+
+        Args:
+            text: CV or job description text
+
+        Returns:
+            Set of canonical skill names
+        """
+        return {self._canonical[match] for match in self._pattern.findall(text.lower())}
+
+    @staticmethod
+    def match(cv_skills: Iterable[str], jd_skills: Iterable[str]) -> Tuple[List[str], List[str], float]:
+        """
+        Compare CV skills with job requirements
+
+        Args:
+            cv_skills: Skills found in the CV
+            jd_skills: Skills required by the job description
+
+        Returns:
+            Tuple of (matching skills, missing skills, keyword score 0-100)
+        """
+        cv_set, jd_set = set(cv_skills), set(jd_skills)
+        matching = sorted(jd_set & cv_set)
+        missing = sorted(jd_set - cv_set)
+        score = min(100, (len(matching) / max(1, len(matching) + len(missing))) * 100 + 20)
+        return matching, missing, score
+
+    @staticmethod
+    def verdict(score: float) -> str:
+        """Bucket a score the way recommendations describe candidates"""
+        return "strong" if score > 70 else "moderate" if score > 50 else "developing"
+
+
+# Create global instance
+skill_service = SkillService()
@@ -0,0 +1,392 @@
+"""
+Vector Index Service
+Local embedding index for ranking a pool of CVs against a job description
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+from app.utils.logger import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process development only
+    fcntl = None
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def chunk_text(text: str, chunk_words: int = 200, overlap: int = 40) -> List[str]:
+    """
+    Split text into overlapping word windows
+
+    Args:
+        text: Text to split
+        chunk_words: Number of words per chunk
+        overlap: Number of words shared by consecutive chunks
+
+    Returns:
+        List of chunks (at least one for non-empty text)
+    """
+    words = text.split()
+    if not words:
+        return []
+    step = max(1, chunk_words - overlap)
+    return [
+        " ".join(words[start:start + chunk_words])
+        for start in range(0, max(1, len(words) - overlap), step)
+    ]
+
+
+class BaseEmbedder(ABC):
+    """Abstract base class for text embedders"""
+
+    name: str = "base"
+    # Whether stored vectors are term frequencies that need IDF weighting at query time
+    uses_idf: bool = False
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into a (len(texts), dim) float32 matrix"""
+        pass
+
+
+class HashingEmbedder(BaseEmbedder):
+    """
+    Hashed TF-IDF embedder (no model download, CPU only)
+
+    Unigrams and bigrams are hashed into a fixed number of buckets with a
+    sublinear term frequency. IDF is not baked into the stored vectors; the
+    index applies it at query time from document frequencies it maintains,
+    so inserting new CVs never requires re-embedding old ones.
+    """
+
+    name = "hashing"
+    uses_idf = True
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = TOKEN_PATTERN.findall(text.lower())
+            terms = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for term, count in Counter(terms).items():
+                bucket = zlib.crc32(term.encode("utf-8")) % self.dim
+                matrix[row, bucket] += 1.0 + math.log(count)
+        return matrix
+
+
+class SentenceTransformerEmbedder(BaseEmbedder):
+    """Local sentence-transformers model running on CPU"""
+
+    name = "sentence-transformers"
+
+    def __init__(self, dim: int, model_name: str):
+        try:
+            from sentence_transformers import SentenceTransformer
+            self.model = SentenceTransformer(model_name, device="cpu")
+            super().__init__(self.model.get_sentence_embedding_dimension())
+            self.name = f"sentence-transformers:{model_name}"
+            logger.info(f"Sentence-transformers embedder initialized with model: {model_name}")
+        except ImportError:
+            raise ImportError(
+                "sentence-transformers package not installed. Run: pip install sentence-transformers"
+            )
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = self.model.encode(texts, batch_size=32, normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+def create_embedder() -> BaseEmbedder:
+    """Create the embedder selected by configuration, falling back to hashing"""
+    backend = settings.EMBEDDING_BACKEND.lower()
+
+    if backend == "sentence-transformers":
+        try:
+            return SentenceTransformerEmbedder(settings.EMBEDDING_DIM, settings.EMBEDDING_MODEL)
+        except ImportError as e:
+            logger.warning(f"{str(e)}; falling back to hashed TF-IDF embeddings")
+            return HashingEmbedder(settings.EMBEDDING_DIM)
+
+    elif backend != "hashing":
+        logger.warning(f"Unknown embedding backend '{backend}', using hashing")
+
+    return HashingEmbedder(settings.EMBEDDING_DIM)
+
+
+class VectorIndex:
+    """
+    Append-only chunk-embedding index persisted as memory-mapped arrays
+
+    Files in the index directory:
+        meta.json     dimensions, row count, capacity and embedder name
+        vectors.f32   (capacity, dim) float32 chunk vectors
+        rows.i32      (capacity,) document id of each chunk row
+        df.f32        (dim,) document frequency per bucket (hashing only)
+        docs.jsonl    one line per document: id, content hash, filename, text
+
+    Inserts append rows in place and grow the files by doubling, so existing
+    vectors are never re-embedded or rewritten. Other workers pick up new rows
+    on their next search by re-reading meta.json.
+    """
+
+    def __init__(self, path: str, embedder: Optional[BaseEmbedder] = None):
+        self.path = path
+        self._embedder = embedder
+        self._lock = threading.Lock()
+        self._meta_mtime: Optional[int] = None
+        self.dim = 0
+        self.count = 0
+        self.capacity = 0
+        self.documents: List[Dict[str, Any]] = []
+        self._hash_to_id: Dict[str, int] = {}
+        self._docs_offset = 0
+        self._vectors: Optional[np.memmap] = None
+        self._rows: Optional[np.memmap] = None
+        self._df: Optional[np.memmap] = None
+
+    @property
+    def embedder(self) -> BaseEmbedder:
+        """Embedder instance, created on first use"""
+        if self._embedder is None:
+            self._embedder = create_embedder()
+        return self._embedder
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _open(self) -> None:
+        """Create the index on first use or (re)map it if another process changed it"""
+        meta_path = self._file("meta.json")
+        if not os.path.exists(meta_path):
+            os.makedirs(self.path, exist_ok=True)
+            self.dim = self.embedder.dim
+            self.count = 0
+            self.capacity = 0
+            self.documents = []
+            self._hash_to_id = {}
+            self._resize(max(64, settings.INDEX_INITIAL_CAPACITY))
+            self._write_meta()
+            return
+
+        mtime = os.stat(meta_path).st_mtime_ns
+        if mtime == self._meta_mtime:
+            return
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["embedder"] != self.embedder.name or meta["dim"] != self.embedder.dim:
+            raise ValueError(
+                f"Index at {self.path} was built with {meta['embedder']} ({meta['dim']} dims); "
+                f"delete it or configure the same embedder"
+            )
+        self.dim = meta["dim"]
+        self.count = meta["count"]
+        self.capacity = meta["capacity"]
+        self._map()
+        self._load_documents()
+        self._meta_mtime = mtime
+
+    def _map(self) -> None:
+        """Memory-map the vector, row and document-frequency files"""
+        self._vectors = np.memmap(self._file("vectors.f32"), dtype=np.float32, mode="r+",
+                                  shape=(self.capacity, self.dim))
+        self._rows = np.memmap(self._file("rows.i32"), dtype=np.int32, mode="r+",
+                               shape=(self.capacity,))
+        self._df = np.memmap(self._file("df.f32"), dtype=np.float32, mode="r+",
+                             shape=(self.dim,))
+
+    def _resize(self, capacity: int) -> None:
+        """Grow the backing files in place (new space is zero-filled)"""
+        for name, row_bytes in (("vectors.f32", self.dim * 4), ("rows.i32", 4)):
+            with open(self._file(name), "ab") as f:
+                f.truncate(capacity * row_bytes)
+        if not os.path.exists(self._file("df.f32")):
+            with open(self._file("df.f32"), "wb") as f:
+                f.truncate(self.dim * 4)
+        self.capacity = capacity
+        self._map()
+
+    def _load_documents(self) -> None:
+        """Read document metadata appended (by any process) since the last load"""
+        docs_path = self._file("docs.jsonl")
+        if not os.path.exists(docs_path):
+            return
+        with open(docs_path, "rb") as f:
+            f.seek(self._docs_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partially written line, picked up next time
+                document = json.loads(line)
+                self.documents.append(document)
+                self._hash_to_id[document["content_hash"]] = document["id"]
+                self._docs_offset += len(line)
+
+    def _write_meta(self) -> None:
+        """Atomically publish the current row count and capacity"""
+        meta = {
+            "dim": self.dim,
+            "count": self.count,
+            "capacity": self.capacity,
+            "embedder": self.embedder.name,
+        }
+        tmp_path = self._file("meta.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._file("meta.json"))
+        self._meta_mtime = os.stat(self._file("meta.json")).st_mtime_ns
+
+    def _exclusive(self):
+        """Cross-process lock held while appending"""
+        os.makedirs(self.path, exist_ok=True)
+        return _FileLock(self._file(".lock"))
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Hash used to deduplicate documents"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def add_document(self, text: str, filename: str = "") -> Tuple[int, bool]:
+        """
+        Chunk, embed and append a document to the index
+
+        Args:
+            text: Extracted CV text
+            filename: Original file name, kept for display
+
+        Returns:
+            Tuple of (document id, whether the document was newly added)
+        """
+        content_hash = self.content_hash(text)
+        chunks = chunk_text(text, settings.INDEX_CHUNK_WORDS, settings.INDEX_CHUNK_OVERLAP)
+        if not chunks:
+            raise ValueError("Cannot index an empty document")
+
+        with self._lock, self._exclusive():
+            self._open()
+            if content_hash in self._hash_to_id:
+                return self._hash_to_id[content_hash], False
+
+            vectors = self.embedder.embed(chunks)
+            needed = self.count + len(chunks)
+            if needed > self.capacity:
+                capacity = self.capacity
+                while capacity < needed:
+                    capacity *= 2
+                self._resize(capacity)
+
+            doc_id = len(self.documents)
+            self._vectors[self.count:needed] = vectors
+            self._rows[self.count:needed] = doc_id
+            if self.embedder.uses_idf:
+                self._df += (vectors > 0).any(axis=0)
+            self._vectors.flush()
+            self._rows.flush()
+            self._df.flush()
+
+            document = {
+                "id": doc_id,
+                "content_hash": content_hash,
+                "filename": filename,
+                "chunks": len(chunks),
+                "text": text,
+            }
+            line = json.dumps(document) + "\n"
+            with open(self._file("docs.jsonl"), "a", encoding="utf-8") as f:
+                f.write(line)
+            self._docs_offset += len(line.encode("utf-8"))
+            self.documents.append(document)
+            self._hash_to_id[content_hash] = doc_id
+
+            self.count = needed
+            self._write_meta()
+
+        logger.info(f"Indexed document {doc_id} ({filename or 'unnamed'}, {len(chunks)} chunks)")
+        return doc_id, True
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Rank indexed documents by cosine similarity to a query
+
+        Each document scores as its best-matching chunk. All chunks are scored
+        in one matrix-vector product over the memory-mapped matrix.
+
+        Args:
+            query: Job description text
+            top_k: Number of documents to return
+
+        Returns:
+            List of (document metadata, similarity) pairs, best first
+        """
+        with self._lock:
+            self._open()
+            if self.count == 0:
+                return []
+            vectors = self._vectors[:self.count]
+            rows = np.asarray(self._rows[:self.count])
+            n_docs = len(self.documents)
+
+            q = self.embedder.embed([query])[0]
+            if self.embedder.uses_idf:
+                idf = np.log((1.0 + n_docs) / (1.0 + self._df)) + 1.0
+                weights = (idf * idf).astype(np.float32)
+                dots = vectors @ (q * weights)
+                norms = np.sqrt(np.maximum((vectors * vectors) @ weights, 1e-12))
+                q_norm = float(np.sqrt(np.dot(q * q, weights)))
+            else:
+                dots = vectors @ q
+                norms = np.maximum(np.linalg.norm(vectors, axis=1), 1e-12)
+                q_norm = float(np.linalg.norm(q))
+            chunk_scores = dots / (norms * max(q_norm, 1e-12))
+
+            doc_scores = np.full(n_docs, -np.inf, dtype=np.float32)
+            np.maximum.at(doc_scores, rows, chunk_scores)
+
+            k = min(top_k, n_docs)
+            best = np.argpartition(-doc_scores, k - 1)[:k]
+            best = best[np.argsort(-doc_scores[best])]
+            # Documents without rows (interrupted insert) score -inf; drop them
+            return [(self.documents[i], float(doc_scores[i])) for i in best
+                    if np.isfinite(doc_scores[i])]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._open()
+            return len(self.documents)
+
+
+class _FileLock:
+    """Exclusive advisory lock on a file (no-op where fcntl is unavailable)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._file = open(self.path, "a")
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+# Create global instance (files are created on first insert or search)
+vector_index = VectorIndex(settings.INDEX_DIR)
@@ -0,0 +1,32 @@
+"""
+Rate Limiter
+Async token bucket for spacing out provider API calls
+"""
+
+import asyncio
+import time
+
+
+class RateLimiter:
+    """Token bucket allowing `rate` acquisitions per `period` seconds, with bursts up to `burst`"""
+
+    def __init__(self, rate: float, period: float = 60.0, burst: int = 1):
+        self.interval = period / rate if rate > 0 else 0.0
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a call is allowed"""
+        if self.interval == 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) / self.interval)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.interval)
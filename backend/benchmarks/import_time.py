@@ -0,0 +1,87 @@
+"""
+Import-Time Benchmark
+Profiles `import app.main` with `python -X importtime` to catch cold-start regressions
+
+Run from the backend directory:
+    python -m benchmarks.import_time [--budget-ms 1500] [--top 15]
+
+Exits with status 1 when the total import time exceeds the budget or when a
+provider SDK or scipy is imported eagerly (they must load on first use or
+warm-up).
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Provider SDKs and heavy libraries that must not be imported while loading the app
+LAZY_MODULES = ("openai", "anthropic", "google.genai", "scipy")
+
+DEFAULT_BUDGET_MS = 1500.0
+
+
+def profile_imports(target: str = "app.main") -> Dict[str, Tuple[int, int]]:
+    """
+    Import a module in a fresh interpreter and collect import timings
+
+    Args:
+        target: Module to import
+
+    Returns:
+        Mapping of module name to (self_us, cumulative_us)
+    """
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, AI_PROVIDER=os.environ.get("AI_PROVIDER", "openai"),
+               AI_API_KEY=os.environ.get("AI_API_KEY", "benchmark-key"))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=backend_dir, env=env, capture_output=True, text=True, check=True
+    )
+
+    timings: Dict[str, Tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header row
+        name = fields[2].strip()
+        timings[name] = (int(fields[0]), int(fields[1]))
+    return timings
+
+
+def eager_sdk_imports(timings: Dict[str, Tuple[int, int]]) -> List[str]:
+    """Return the lazily loaded modules that were imported eagerly"""
+    return [module for module in LAZY_MODULES if module in timings]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    timings = profile_imports()
+    total_ms = timings["app.main"][1] / 1000
+
+    print(f"{'cumulative ms':>14}  {'self ms':>8}  module")
+    top = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)[:args.top]
+    for name, (self_us, cumulative_us) in top:
+        print(f"{cumulative_us / 1000:>14.1f}  {self_us / 1000:>8.1f}  {name}")
+    print(f"\nimport app.main: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    eager = eager_sdk_imports(timings)
+    if eager:
+        print(f"FAIL: lazy modules imported at startup: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("FAIL: import time budget exceeded")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
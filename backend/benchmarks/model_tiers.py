@@ -0,0 +1,91 @@
+"""
+Model Tier Benchmark
+Latency, cost and verdict agreement per model tier on a labelled local sample
+
+Run from the backend directory (uses the configured provider; set
+AI_FAST_MODEL to compare two tiers):
+    python -m benchmarks.model_tiers [--sample benchmarks/data/tier_sample.jsonl]
+
+Every sample is analyzed once per tier and once through the routing policy.
+Verdicts bucket scores the way recommendations do (SkillService.verdict).
+Reported agreement:
+    fast vs large   how often the cheap tier reaches the large tier's verdict
+    policy vs label how often the routed result matches the human label
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from app.core.config import settings
+from app.services.ai_service import ai_service
+from app.services.model_policy import TIER_FAST, TIER_LARGE, TierStats, model_policy
+from app.services.skill_service import skill_service
+
+DEFAULT_SAMPLE = os.path.join(os.path.dirname(__file__), "data", "tier_sample.jsonl")
+
+
+async def run(samples):
+    provider = await ai_service.get_provider()
+    tiers = {TIER_LARGE: settings.AI_MODEL or None}
+    if settings.AI_FAST_MODEL:
+        tiers[TIER_FAST] = settings.AI_FAST_MODEL
+    stats = TierStats()
+    rows = []
+
+    for sample in samples:
+        cv_text, job_description = sample["cv_text"], sample["job_description"]
+        decision = model_policy.plan(cv_text, job_description)
+        row = {"label": sample["label"], "routed": decision.tier}
+        scores = {}
+        for tier, model in tiers.items():
+            started = time.monotonic()
+            result = await provider.analyze_cv(
+                cv_text, job_description, model=model,
+                max_tokens=decision.max_tokens + provider.output_token_overhead
+            )
+            stats.record(tier, time.monotonic() - started, decision.input_tokens,
+                         len(json.dumps(result)) // 4 + 1)
+            scores[tier] = float(result["score"])
+            row[tier] = skill_service.verdict(scores[tier])
+
+        # Replay the routing policy from the per-tier results
+        policy_tier = decision.tier if decision.tier in scores else TIER_LARGE
+        row["escalated"] = (policy_tier == TIER_FAST
+                            and model_policy.needs_escalation(decision, scores[TIER_FAST]))
+        row["policy"] = row[TIER_LARGE] if row["escalated"] else row[policy_tier]
+        rows.append(row)
+    return rows, stats.snapshot()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sample", default=DEFAULT_SAMPLE)
+    args = parser.parse_args()
+    logging.getLogger("smartresume").setLevel(logging.WARNING)
+
+    with open(args.sample, "r", encoding="utf-8") as f:
+        samples = [json.loads(line) for line in f if line.strip()]
+    rows, tier_stats = asyncio.run(run(samples))
+
+    def rate(predicate):
+        return 100.0 * sum(1 for row in rows if predicate(row)) / len(rows)
+
+    print(f"provider: {ai_service.provider_class.__name__}  samples: {len(rows)}")
+    print(f"{'tier':<8}{'calls':>7}{'mean ms':>10}{'max ms':>10}{'cost/call':>12}")
+    for tier, stats in tier_stats.items():
+        print(f"{tier:<8}{stats['calls']:>7}{stats['mean_latency_ms']:>10.1f}"
+              f"{stats['max_latency_ms']:>10.1f}{stats['mean_cost']:>12.5f}")
+    print(f"\nrouted to fast tier: {rate(lambda r: r['routed'] == TIER_FAST):.0f}%"
+          f"  escalated: {rate(lambda r: r['escalated']):.0f}%")
+    if TIER_FAST in tier_stats:
+        print(f"fast vs large agreement:   {rate(lambda r: r[TIER_FAST] == r[TIER_LARGE]):.0f}%")
+    print(f"large vs label agreement:  {rate(lambda r: r[TIER_LARGE] == r['label']):.0f}%")
+    print(f"policy vs label agreement: {rate(lambda r: r['policy'] == r['label']):.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
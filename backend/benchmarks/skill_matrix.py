@@ -0,0 +1,76 @@
+"""
+Skill Matrix Benchmark
+Compares the sparse bulk matrix with looping the per-pair mock analysis
+
+Run from the backend directory:
+    python -m benchmarks.skill_matrix [--cvs 2000] [--jobs 50]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+import numpy as np
+from app.services.ai_service import MockAIProvider
+from app.services.skill_matrix import skill_matrix_service
+from app.services.skill_service import SKILL_ALIASES
+
+FILLER = ("experience team project delivered built designed led maintained "
+          "customers production reliability performance stakeholders").split()
+
+
+def synthetic_texts(count: int, skills_per_text: int, words: int, seed: int):
+    """Random CV/job-like texts mixing skill spellings with filler words"""
+    rng = random.Random(seed)
+    spellings = [alias for aliases in SKILL_ALIASES.values() for alias in aliases]
+    texts = []
+    for _ in range(count):
+        tokens = rng.sample(spellings, skills_per_text) + rng.choices(FILLER, k=words)
+        rng.shuffle(tokens)
+        texts.append(" ".join(tokens))
+    return texts
+
+
+async def per_pair(cv_texts, job_texts):
+    """Score every pair through the per-call local path (MockAIProvider.analyze_cv)"""
+    provider = MockAIProvider()
+    scores = np.zeros((len(cv_texts), len(job_texts)))
+    for i, cv_text in enumerate(cv_texts):
+        for j, job_text in enumerate(job_texts):
+            scores[i, j] = (await provider.analyze_cv(cv_text, job_text))["score"]
+    return scores
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cvs", type=int, default=2000)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--words", type=int, default=400, help="Filler words per CV")
+    args = parser.parse_args()
+
+    cv_texts = synthetic_texts(args.cvs, 12, args.words, seed=1)
+    job_texts = synthetic_texts(args.jobs, 8, args.words // 4, seed=2)
+    pairs = args.cvs * args.jobs
+
+    started = time.perf_counter()
+    matrix = skill_matrix_service.match_texts(cv_texts, job_texts)
+    bulk_s = time.perf_counter() - started
+
+    # The mock provider logs every call; keep that out of the timing
+    logging.getLogger("smartresume").setLevel(logging.WARNING)
+    started = time.perf_counter()
+    looped = asyncio.run(per_pair(cv_texts, job_texts))
+    loop_s = time.perf_counter() - started
+
+    agree = np.allclose(np.round(matrix.scores, 1), looped)
+    print(f"pairs:        {pairs}")
+    print(f"sparse bulk:  {bulk_s * 1000:9.1f} ms  ({pairs / bulk_s:,.0f} pairs/s)")
+    print(f"per-pair:     {loop_s * 1000:9.1f} ms  ({pairs / loop_s:,.0f} pairs/s)")
+    print(f"speedup:      {loop_s / bulk_s:9.1f}x")
+    print(f"scores agree: {agree}")
+    return 0 if agree else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,35 @@
+"""
+Gunicorn Configuration
+Production launch mode: several uvicorn workers forked from a preloaded app
+
+Run with: gunicorn -c gunicorn.conf.py app.main:app
+"""
+
+import os
+from app.core.config import settings
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = settings.worker_count
+
+# Import the application (settings, services, provider SDKs) once in the
+# master so workers fork warm and share the imported code pages.
+preload_app = True
+
+# Give in-flight LLM calls time to drain on SIGTERM before workers are killed
+graceful_timeout = int(settings.SHUTDOWN_DRAIN_TIMEOUT) + 5
+timeout = 120
+keepalive = 5
+
+# Trust X-Forwarded-For from these proxies so admission control sees the real client
+forwarded_allow_ips = settings.FORWARDED_ALLOW_IPS
+
+loglevel = settings.LOG_LEVEL.lower()
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    """Import the provider SDK in the master so forked workers inherit it"""
+    from app.services.ai_service import ai_service
+    ai_service.import_sdk()
@@ -30,6 +30,16 @@ def test_health_endpoint():
     assert "checks" in data
 
 
+def test_health_endpoint_reports_failed_provider(monkeypatch):
+    """Test that a failed AI provider warm-up makes the health check fail"""
+    from app.services.ai_service import ai_service
+
+    monkeypatch.setattr(ai_service, "warmup_status", "failed")
+    response = client.get("/health")
+    assert response.status_code == 503
+    assert response.json()["status"] == "degraded"
+
+
 def test_analyze_endpoint_missing_file():
     """Test analyze endpoint without file"""
     response = client.post(
@@ -76,5 +86,62 @@ def test_analyze_endpoint_short_job_description():
     assert response.status_code == 400
 
 
+def test_analyze_endpoint_rejects_saturated_tenant(monkeypatch):
+    """Test 429 with Retry-After when the client's tenant has no free slot"""
+    from app.core.admission import ConcurrencyLimit, admission_controller
+    from app.core.config import settings
+
+    saturated = ConcurrencyLimit("tenant", 1, 0, 429, "Too many concurrent requests")
+    saturated.active = 1
+    # The test client address is "testclient" or absent depending on the Starlette version
+    client_keys = ("ip:testclient", "ip:unknown")
+    for key in client_keys:
+        admission_controller.tenants[key] = saturated
+    try:
+        # An API key that is not configured does not get a fresh tenant
+        response = client.post(
+            "/api/analyze",
+            headers={"X-API-Key": "made-up"},
+            files={"cv_file": ("test.pdf", io.BytesIO(b"%PDF-1.4 fake pdf"), "application/pdf")},
+            data={"job_description": "Looking for a Python developer"}
+        )
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+
+        # A configured key does
+        monkeypatch.setattr(settings, "API_KEYS", "partner-key")
+        response = client.post(
+            "/api/analyze",
+            headers={"X-API-Key": "partner-key"},
+            files={"cv_file": ("test.pdf", io.BytesIO(b"%PDF-1.4 fake pdf"), "application/pdf")},
+            data={"job_description": "Looking for a Python developer"}
+        )
+        assert response.status_code == 400
+    finally:
+        for key in client_keys:
+            admission_controller.tenants.pop(key, None)
+
+
+def test_metrics_endpoint():
+    """Test admission and tier metrics endpoint"""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    data = response.json()
+    assert "rejected" in data["admission"]["tenants"]
+    assert {"global", "pdf", "llm"} <= set(data["admission"])
+    assert "in_flight" in data["ai_service"]
+
+
+def test_rank_endpoint_rejects_top_k_above_limit():
+    """Test that top_k above RANK_MAX_TOP_K is a validation error, not silently capped"""
+    from app.core.config import settings
+
+    response = client.post(
+        "/api/candidates/rank",
+        json={"job_description": "Looking for a Python developer", "top_k": settings.RANK_MAX_TOP_K + 1}
+    )
+    assert response.status_code == 422
+
+
 # Note: Full integration test with real PDF would require a valid PDF file
 # and would be better suited for integration tests
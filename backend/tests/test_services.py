@@ -0,0 +1,447 @@
+"""
+Unit tests for backend services
+"""
+
+import asyncio
+from app.services.ai_service import AIService, MockAIProvider
+from app.services.cache_service import MemoryCacheBackend, SQLiteCacheBackend
+
+
+def test_memory_cache_evicts_oldest_entry():
+    """Test LRU eviction in the in-process cache"""
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("a", "1", ttl=60)
+    backend.set("b", "2", ttl=60)
+    backend.get("a")
+    backend.set("c", "3", ttl=60)
+    assert backend.get("a") == "1"
+    assert backend.get("b") is None
+    assert backend.get("c") == "3"
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    """Test that two backends on the same file see each other's writes"""
+    path = str(tmp_path / "cache.db")
+    SQLiteCacheBackend(path).set("key", "value", ttl=60)
+    assert SQLiteCacheBackend(path).get("key") == "value"
+    assert SQLiteCacheBackend(path).get("missing") is None
+
+
+def test_worker_count_honours_cgroup_cpu_quota(tmp_path, monkeypatch):
+    """Test that the cgroup CPU quota caps the derived worker count"""
+    from app.core import config
+
+    assert config.cgroup_cpu_limit(str(tmp_path)) is None
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert config.cgroup_cpu_limit(str(tmp_path)) is None
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    assert config.cgroup_cpu_limit(str(tmp_path)) == 2
+
+    (tmp_path / "cpu.max").unlink()
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("50000\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    assert config.cgroup_cpu_limit(str(tmp_path)) == 1
+
+    monkeypatch.setattr(config, "cgroup_cpu_limit", lambda: 1)
+    assert config.Settings(WEB_CONCURRENCY=0, MAX_WORKERS=8).worker_count == 1
+
+
+def test_sqlite_cache_prunes_expired_rows_periodically(tmp_path):
+    """Test that expired rows are deleted every prune_every writes, not on each write"""
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), prune_every=3)
+    backend.set("old", "1", ttl=-1)
+    backend.set("a", "2", ttl=60)
+
+    def count():
+        return backend._connection().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    assert count() == 2
+    backend.set("b", "3", ttl=60)
+    assert count() == 2
+    assert backend.get("old") is None
+
+
+def test_drain_waits_for_in_flight_calls():
+    """Test that drain blocks until running LLM calls complete"""
+
+    class SlowProvider(MockAIProvider):
+        async def analyze_cv(self, cv_text, job_description, **kwargs):
+            await asyncio.sleep(0.05)
+            return await super().analyze_cv(cv_text, job_description, **kwargs)
+
+    async def scenario():
+        service = AIService()
+        service.provider = SlowProvider()
+        task = asyncio.create_task(service.analyze_resume("python developer", "python role unique"))
+        await asyncio.sleep(0.01)
+        assert service.in_flight == 1
+        assert await service.drain(timeout=1.0)
+        assert task.done()
+        assert service.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_provider_is_built_lazily():
+    """Test that selecting a provider does not construct it until warm-up"""
+
+    async def scenario():
+        service = AIService()
+        assert service._provider is None
+        assert service.warmup_status == "pending"
+        await service.warm_up()
+        assert service.warmup_status == "ready"
+        assert isinstance(service.provider, service.provider_class)
+
+    asyncio.run(scenario())
+
+
+def test_app_import_does_not_load_provider_sdks():
+    """Test that provider SDKs stay out of the startup import graph"""
+    from benchmarks.import_time import eager_sdk_imports, profile_imports
+    timings = profile_imports()
+    assert "app.main" in timings
+    assert eager_sdk_imports(timings) == []
+
+
+def test_vector_index_ranks_and_appends_incrementally(tmp_path, monkeypatch):
+    """Test top-K ranking and that inserts append rows without rebuilding"""
+    from app.core.config import settings
+    from app.services.vector_index import HashingEmbedder, VectorIndex
+
+    monkeypatch.setattr(settings, "INDEX_INITIAL_CAPACITY", 64)
+    index = VectorIndex(str(tmp_path), HashingEmbedder(256))
+    index.add_document("Senior Python developer with FastAPI, Docker and AWS", "python.pdf")
+    index.add_document("Frontend engineer: React, TypeScript, CSS and Figma", "react.pdf")
+    first_row = index._vectors[0].copy()
+
+    # Force the backing files to grow past the initial capacity
+    for i in range(70):
+        index.add_document(f"Accountant number {i} with Excel and bookkeeping", f"acc{i}.pdf")
+    assert index.capacity == 128
+    assert (index._vectors[0] == first_row).all()
+
+    doc_id, created = index.add_document("Senior Python developer with FastAPI, Docker and AWS")
+    assert (doc_id, created) == (0, False)
+
+    reopened = VectorIndex(str(tmp_path), HashingEmbedder(256))
+    results = reopened.search("Python backend developer, FastAPI and Docker", top_k=2)
+    assert len(reopened) == 72
+    assert [doc["filename"] for doc, _ in results][0] == "python.pdf"
+
+
+def test_skill_service_extracts_canonical_skills():
+    """Test alias handling and word boundaries in skill extraction"""
+    from app.services.skill_service import skill_service
+    skills = skill_service.extract("Built REST APIs in Python/FastAPI, deployed on K8s. Rapid learner.")
+    assert skills == {"api", "python", "fastapi", "kubernetes"}
+
+
+def test_corpus_job_edit_rescoring_is_incremental(tmp_path, monkeypatch):
+    """Test that a job edit re-scores locally and only queues pairs whose outcome may change"""
+    from app.core.config import settings
+    from app.services.corpus_store import CorpusStore, process_reanalysis_queue
+
+    monkeypatch.setattr(settings, "RESCORE_LLM_THRESHOLD", 25.0)
+    store = CorpusStore(str(tmp_path / "corpus.db"))
+    store.add_cv("Python, FastAPI, Docker, SQL and AWS engineer", "backend.pdf")
+    store.add_cv("Python and SQL developer", "junior.pdf")
+    job = store.add_job("Backend", "Python developer with FastAPI, Docker and SQL")
+
+    service = AIService()
+    service.provider = MockAIProvider()
+    assert asyncio.run(process_reanalysis_queue(store, service, batch_size=5)) == 2
+    assert {r["status"] for r in store.job_results(job["id"])} == {"fresh"}
+
+    # Same requirements, different wording: nothing to redo
+    summary = store.update_job(job["id"], "Backend", "Engineer: Python, FastAPI, Docker, SQL")
+    assert (summary["unchanged"], summary["local"], summary["queued"]) == (2, 0, 0)
+
+    # Adding AWS helps the senior CV a little and hurts the junior CV a little
+    summary = store.update_job(job["id"], "Backend", "Python, FastAPI, Docker, SQL and AWS")
+    assert summary["added_requirements"] == ["aws"]
+    results = {r["filename"]: r for r in store.job_results(job["id"])}
+    assert results["backend.pdf"]["status"] == "local"
+    assert "aws" in results["backend.pdf"]["analysis"]["matching_skills"]
+    assert "aws" in results["junior.pdf"]["analysis"]["missing_skills"]
+    assert (summary["local"], summary["queued"]) == (2, 0)
+
+    # A different role entirely changes every outcome
+    summary = store.update_job(job["id"], "Platform", "Rust and Kubernetes platform engineer")
+    assert summary["queued"] == 2
+
+
+def test_corpus_reclaims_pairs_after_lease_expiry(tmp_path, monkeypatch):
+    """Test that pairs claimed by a worker that died are picked up again"""
+    from app.core.config import settings
+    from app.services.corpus_store import CorpusStore
+
+    store = CorpusStore(str(tmp_path / "corpus.db"))
+    store.add_cv("Python and SQL developer", "cv.pdf")
+    store.add_job("Backend", "Python developer with SQL")
+
+    assert len(store.claim_queued(5)) == 1
+    assert store.claim_queued(5) == []
+
+    monkeypatch.setattr(settings, "CORPUS_LEASE_SECONDS", -1.0)
+    assert len(store.claim_queued(5)) == 1
+
+
+def test_skill_matrix_matches_per_pair_scoring():
+    """Test that the sparse bulk matrix agrees with per-pair matching"""
+    from app.services.skill_matrix import skill_matrix_service
+    from app.services.skill_service import skill_service
+
+    cvs = ["Python, FastAPI and Docker", "React and TypeScript", "Java, Spring Boot, SQL, AWS"]
+    jobs = ["Python backend with Docker and AWS", "Frontend React developer", "Office manager"]
+    matrix = skill_matrix_service.match_texts(cvs, jobs)
+
+    for i, cv in enumerate(cvs):
+        for j, job in enumerate(jobs):
+            matching, missing, score = skill_service.match(
+                skill_service.extract(cv), skill_service.extract(job)
+            )
+            assert matrix.scores[i, j] == score
+            assert matrix.matching_skills(i, j) == [s for s in matrix.vocabulary if s in matching]
+            assert matrix.missing[i, j] == len(missing)
+    assert matrix.top_cvs(0, 1) == [0]
+
+
+def test_screen_cli_resumes_from_checkpoint(tmp_path):
+    """Test that the bulk screening CLI skips files finished by an earlier run"""
+    import json
+    from app.cli import screen
+
+    cvs = tmp_path / "cvs"
+    cvs.mkdir()
+    for i in range(3):
+        (cvs / f"cv{i}.txt").write_text(f"Candidate {i}: Python and Docker")
+    job = tmp_path / "job.txt"
+    job.write_text("Python developer with Docker and AWS")
+    output = tmp_path / "results.jsonl"
+    args = ["--cvs", str(cvs), "--job", str(job), "--output", str(output),
+            "--workers", "1", "--rate", "0"]
+
+    assert screen.main(args) == 0
+    (cvs / "cv3.txt").write_text("Candidate 3: React")
+    assert screen.main(args) == 0
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(r["file"] for r in records) == ["cv0.txt", "cv1.txt", "cv2.txt", "cv3.txt"]
+    assert all(r["status"] == "ok" for r in records)
+
+    # The checkpoint belongs to the first job: another job must not reuse it
+    job.write_text("Frontend developer with React")
+    assert screen.main(args) == 2
+    assert len(output.read_text().splitlines()) == 4
+
+
+def test_admission_rejects_saturated_tenant_with_retry_after():
+    """Test per-key limits, bounded queues and Retry-After on rejection"""
+    import time
+    from app.core.admission import AdmissionRejected, ConcurrencyLimit
+
+    async def scenario():
+        limit = ConcurrencyLimit("tenant", limit=1, max_queue=1, reject_status=429, busy_message="busy")
+        deadline = time.monotonic() + 5
+        granted = await limit.acquire(deadline)
+
+        queued = asyncio.create_task(limit.acquire(deadline))
+        await asyncio.sleep(0)
+        assert limit.waiting == 1
+
+        try:
+            await limit.acquire(deadline)
+            assert False, "queue should be full"
+        except AdmissionRejected as e:
+            assert e.status_code == 429
+            assert int(e.headers["Retry-After"]) >= 1
+
+        limit.release(granted)
+        limit.release(await queued)
+        assert (limit.active, limit.waiting, limit.rejected) == (0, 0, 1)
+
+        # With a known hold time, a caller whose deadline cannot be met is turned away at once
+        limit._hold_time = 30.0
+        held = await limit.acquire(deadline)
+        try:
+            await limit.acquire(time.monotonic() + 1)
+            assert False, "deadline cannot be met"
+        except AdmissionRejected as e:
+            assert "deadline" in e.detail
+        limit.release(held)
+
+    asyncio.run(scenario())
+
+
+def test_background_analyses_wait_for_llm_slots(monkeypatch):
+    """Test that background callers queue for LLM slots while request callers are rejected"""
+    from app.core.admission import AdmissionRejected, ConcurrencyLimit, admission_controller
+
+    class SlowProvider(MockAIProvider):
+        async def analyze_cv(self, cv_text, job_description, model=None, max_tokens=None):
+            await asyncio.sleep(0.05)
+            return await super().analyze_cv(cv_text, job_description, model, max_tokens)
+
+    monkeypatch.setattr(admission_controller, "llm_limit",
+                        ConcurrencyLimit("llm", 1, 0, 503, "Analysis capacity busy"))
+    service = AIService()
+    service.provider = SlowProvider()
+
+    async def scenario():
+        background = [
+            asyncio.create_task(service.analyze_resume(f"Python developer {i}", "Python role", background=True))
+            for i in range(4)
+        ]
+        await asyncio.sleep(0.01)
+        try:
+            await service.analyze_resume("Python developer, web request", "Python role")
+            assert False, "request caller should be rejected while the slot is busy"
+        except AdmissionRejected as e:
+            assert e.status_code == 503
+        return await asyncio.gather(*background)
+
+    assert all("score" in result for result in asyncio.run(scenario()))
+
+
+def test_analysis_cache_key_follows_prompt_settings(monkeypatch):
+    """Test that changing how the CV prompt is built does not return results for the old prompt"""
+    from app.core.config import settings
+
+    class CountingProvider(MockAIProvider):
+        calls = 0
+
+        async def analyze_cv(self, cv_text, job_description, model=None, max_tokens=None):
+            CountingProvider.calls += 1
+            return await super().analyze_cv(cv_text, job_description, model, max_tokens)
+
+    service = AIService()
+    service.provider = CountingProvider()
+    cv = "Experience\nPython and Docker engineer at Acme, 2018 - 2022\n\nSkills\nAWS, SQL"
+    asyncio.run(service.analyze_resume(cv, "Python developer role"))
+    asyncio.run(service.analyze_resume(cv, "Python developer role"))
+    assert CountingProvider.calls == 1
+
+    monkeypatch.setattr(settings, "AI_MAX_CV_CHARS", 40)
+    asyncio.run(service.analyze_resume(cv, "Python developer role"))
+    assert CountingProvider.calls == 2
+
+
+def test_truncated_response_is_retried_with_full_budget():
+    """Test that a response cut off at the output budget is retried once with AI_MAX_TOKENS"""
+    from app.core.config import settings
+    from app.services.ai_service import TruncatedResponseError
+
+    class TruncatingProvider(MockAIProvider):
+        output_token_overhead = 100
+
+        def __init__(self):
+            super().__init__()
+            self.budgets = []
+
+        async def analyze_cv(self, cv_text, job_description, model=None, max_tokens=None):
+            self.budgets.append(max_tokens)
+            if max_tokens < settings.AI_MAX_TOKENS + self.output_token_overhead:
+                raise TruncatedResponseError("cut off")
+            return await super().analyze_cv(cv_text, job_description, model, max_tokens)
+
+    service = AIService()
+    service.provider = TruncatingProvider()
+    result = asyncio.run(service.analyze_resume("Python developer, truncated", "Python developer role"))
+    assert "score" in result
+    assert service.provider.budgets[-1] == settings.AI_MAX_TOKENS + 100
+    assert len(service.provider.budgets) == 2
+
+
+def test_gemini_thinking_budget_only_for_thinking_models():
+    """Test that the thinking budget is reserved only for Gemini models that think"""
+    from app.services.ai_service import GeminiProvider
+
+    provider = GeminiProvider.__new__(GeminiProvider)  # no SDK needed
+    provider.model_name = "gemini-2.5-flash"
+    assert provider.output_overhead() == GeminiProvider.output_token_overhead
+    assert provider.output_overhead("gemini-2.5-pro") == GeminiProvider.output_token_overhead
+    assert provider.output_overhead("gemini-2.0-flash-lite") == 0
+    assert provider.output_overhead("gemini-1.5-flash") == 0
+
+
+def test_model_policy_routes_and_escalates(monkeypatch):
+    """Test token budgeting, tier routing and borderline escalation"""
+    from app.core.config import settings
+    from app.services.model_policy import TIER_FAST, TIER_LARGE, model_policy
+
+    monkeypatch.setattr(settings, "AI_FAST_MODEL", "")
+    assert model_policy.plan("Python developer", "Python role").tier == TIER_LARGE
+
+    monkeypatch.setattr(settings, "AI_FAST_MODEL", "small-model")
+    monkeypatch.setattr(settings, "AI_FAST_MAX_INPUT_TOKENS", 100)
+    short = model_policy.plan("Python developer", "Python and Docker role")
+    assert (short.tier, short.reason) == (TIER_FAST, "small input")
+
+    filler = " experience" * 400
+    clear = model_policy.plan("Office manager" + filler, "Python, Docker, AWS, Kubernetes" + filler)
+    ambiguous = model_policy.plan("Python and Docker" + filler, "Python, Docker, AWS, Kubernetes" + filler)
+    assert (clear.tier, clear.reason) == (TIER_FAST, "clear-cut pre-score")
+    assert ambiguous.tier == TIER_LARGE
+    assert short.max_tokens < ambiguous.max_tokens <= settings.AI_MAX_TOKENS
+
+    assert model_policy.needs_escalation(short, 60.0)
+    assert not model_policy.needs_escalation(short, 95.0)
+    escalated = model_policy.escalate(short)
+    assert (escalated.tier, escalated.model, escalated.escalated) == (TIER_LARGE, settings.AI_MODEL, True)
+
+
+def test_cv_parser_sections_dates_and_cache():
+    """Test section segmentation, experience dates, prompt compaction and caching"""
+    from app.services.cv_parser import CVParser
+
+    text = (
+        "JANE DOE\njane@example.com\n\n"
+        "Experience\nBackend engineer, Acme (2016 - 2019)\nBuilt APIs in Python and Django\n"
+        "Data engineer, Initech, Jan 2018 – 2021\nSpark pipelines\n\n"
+        "Education:\nMSc Computer Science, 2015\n\n"
+        "SKILLS\nDocker, Kubernetes, SQL\n\n"
+        "Interests\nChess, hiking\n"
+    )
+    parser = CVParser(cache_size=1)
+    parsed = parser.parse(text)
+
+    assert [s.kind for s in parsed.sections] == ["header", "experience", "education", "skills", "interests"]
+    assert parsed.section("experience").date_ranges == (("2016", "2019"), ("Jan 2018", "2021"))
+    assert parsed.years_of_experience == 5.0
+    assert {"python", "django"} <= parsed.section("experience").skills
+    assert {"docker", "kubernetes", "sql"} <= parsed.section("skills").skills
+    assert parsed.section("skills").skills <= parsed.skills
+
+    prompt = parsed.prompt_text(max_chars=10_000)
+    assert "Chess" not in prompt
+    assert prompt.index("SKILLS") < prompt.index("EXPERIENCE") < prompt.index("EDUCATION")
+    assert len(parsed.prompt_text(max_chars=50)) == 50
+
+    assert parser.parse(text) is parsed
+    parser.parse("another CV")
+    assert parser.parse(text) is not parsed
+
+
+def test_cv_parser_keeps_all_caps_employers_in_experience():
+    """Test that employer names in capitals do not split the experience section"""
+    from app.services.cv_parser import CVParser
+
+    text = (
+        "John Smith\n\n"
+        "EXPERIENCE\n"
+        "ACME CORP\nBackend engineer, 2016 - 2019\nPython services\n\n"
+        "GLOBEX INC\nLead engineer, 2019 - 2022\nKubernetes platform\n\n"
+        "EDUCATION\nBSc Computer Science, 2012 - 2016\n\n"
+        "SKILLS\nDocker\n\n"
+        "VOLUNTEERING\nCode club mentor\n"
+    )
+    parsed = CVParser().parse(text)
+
+    assert [s.kind for s in parsed.sections] == ["header", "experience", "education", "skills", "other"]
+    assert "GLOBEX INC" in parsed.section("experience").text
+    assert parsed.years_of_experience == 6.0
+    prompt = parsed.prompt_text(max_chars=10_000)
+    assert prompt.index("John Smith") < prompt.index("EXPERIENCE\nACME CORP") < prompt.index("EDUCATION")
+    assert prompt.index("EDUCATION") < prompt.index("SKILLS") < prompt.index("VOLUNTEERING")